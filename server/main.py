@@ -1,57 +1,183 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
-from urllib.parse import urlparse, parse_qs
+from typing import Optional, Union
 from pathlib import Path
 import os
 import time
+import asyncio
+import logging
+import threading
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIStatusError, RateLimitError
 import httpx
 from youtube_transcript_api import (
     YouTubeTranscriptApi,
     TranscriptsDisabled,
     NoTranscriptFound,
+    VideoUnavailable,
+    InvalidVideoId,
+    TooManyRequests,
 )
-import youtube_transcript_api as yta
-import yt_dlp
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_before_delay,
+)
+from diskcache import Cache
+from cachetools import TLRUCache, TTLCache
 import tempfile
+import contextlib
+import io
 import shutil
 import hashlib
-import json
-import time
+import importlib.metadata
+import orjson
 import random
+import re
+from functools import lru_cache
+from types import MappingProxyType
 
 # .env 로드 (server 폴더 기준)
 load_dotenv(dotenv_path=Path(__file__).parent / ".env", encoding="utf-8", override=True)
 
 # 환경변수만 사용 (하드코딩 금지)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+YOUTUBE_PROXY = os.getenv("YOUTUBE_PROXY")
+YTDLP_COOKIES_FILE = os.getenv("YTDLP_COOKIES_FILE")
+YTDLP_COOKIES_BROWSER = os.getenv("YTDLP_COOKIES_BROWSER")
+
+# yt-dlp 기반 경로(Whisper 전사, 영상 길이, 대안 추출) 사용 여부
+ENABLE_WHISPER_FALLBACK = os.getenv("ENABLE_WHISPER_FALLBACK", "1").lower() not in ("0", "false", "no")
+
+
+@lru_cache(maxsize=1)
+def _yt_dlp():
+    """yt_dlp는 수백 개 추출기 모듈을 import하므로 기동 시가 아니라 처음 필요할 때 한 번만 로드"""
+    import yt_dlp
+    return yt_dlp
+
+# print 대신 레벨 게이트가 있는 로거 사용 (LOG_LEVEL로 조절, 지연 포매팅)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger("yt_summary")
 
-# 간단한 메모리 캐시 (실제 운영에서는 Redis 사용 권장)
-CACHE = {}
+# 메모리 캐시: 디스크 캐시 앞단의 L1 (워커 간 공유·재시작 후 유지는 디스크 캐시가 담당)
+# 최근에 조회된 항목을 남기는 LRU (최대 100개 항목), CACHE_TTL_SEC가 지난 항목은 만료
+CACHE_TTL_SEC = int(os.getenv("CACHE_TTL_SEC", "86400"))
+CACHE = TTLCache(maxsize=100, ttl=CACHE_TTL_SEC)
+# cachetools 캐시는 스레드 안전하지 않으므로 (조회도 LRU 순서/만료 정리로 내부 상태를 바꿈) 락으로 보호
+_CACHE_LOCK = threading.Lock()
 
 def get_cache_key(video_id: str) -> str:
     """비디오 ID로 캐시 키 생성"""
     return f"video_{video_id}"
 
 def get_cached_result(video_id: str) -> Optional[dict]:
-    """캐시에서 결과 조회"""
+    """메모리 캐시 → 디스크 캐시 순으로 결과 조회 (디스크 적중 시 메모리에 적재)"""
     cache_key = get_cache_key(video_id)
-    return CACHE.get(cache_key)
+    with _CACHE_LOCK:
+        result = CACHE.get(cache_key)
+    if result is None:
+        result = DISK_CACHE.get(cache_key)
+        if result is not None:
+            with _CACHE_LOCK:
+                CACHE[cache_key] = result
+    return result
+
+def _memory_cache_size() -> int:
+    """만료 항목을 정리한 뒤의 메모리 캐시 크기"""
+    with _CACHE_LOCK:
+        CACHE.expire()
+        return len(CACHE)
 
 def set_cached_result(video_id: str, result: dict) -> None:
-    """결과를 캐시에 저장"""
+    """결과를 메모리/디스크 캐시에 저장"""
     cache_key = get_cache_key(video_id)
-    CACHE[cache_key] = result
-    # 메모리 사용량 제한 (최대 100개 항목)
-    if len(CACHE) > 100:
-        # 가장 오래된 항목 제거
-        oldest_key = next(iter(CACHE))
-        del CACHE[oldest_key]
+    with _CACHE_LOCK:
+        CACHE[cache_key] = result
+    DISK_CACHE.set(cache_key, result, expire=CACHE_TTL_SEC)
+
+
+# 디스크 캐시: 재시작 후에도 자막/요약 재사용 (YouTube 재요청, OpenAI 재호출 방지)
+DISK_CACHE = Cache(os.getenv("DISK_CACHE_DIR") or str(Path(__file__).parent / ".cache"))
+DISK_CACHE.stats(enable=True)
+TRANSCRIPT_CACHE_TTL = 7 * 86400  # 자막: 7일
+SUMMARY_CACHE_TTL = 30 * 86400  # 요약: 30일
+DURATION_CACHE_TTL = 90 * 86400  # 영상 길이: 한 번 올라간 영상은 바뀌지 않으므로 길게 유지
+# 실제 자막/전사 결과만 캐시 (제목만 얻은 대체 결과는 제외)
+NON_CACHEABLE_TRANSCRIPT_SOURCES = {"youtube_api", "selenium", "alternative"}
+
+def get_cached_transcript(video_id: str) -> Optional[tuple[str, Optional[str]]]:
+    """디스크 캐시에서 자막 조회"""
+    cached = DISK_CACHE.get(f"transcript:{video_id}")
+    return tuple(cached) if cached else None
+
+def set_cached_transcript(video_id: str, text: str, lang_code: Optional[str]) -> None:
+    """자막을 디스크 캐시에 저장"""
+    if lang_code not in NON_CACHEABLE_TRANSCRIPT_SOURCES:
+        DISK_CACHE.set(f"transcript:{video_id}", (text, lang_code), expire=TRANSCRIPT_CACHE_TTL)
+
+def get_summary_cache_key(video_id: str, lang_code: Optional[str]) -> str:
+    """프롬프트/모델이 바뀌면 자동으로 무효화되는 요약 캐시 키"""
+    prompt_hash = hashlib.sha1(
+        f"{SUMMARY_SYSTEM_PROMPT}|{lang_code}|{SUMMARY_MODEL}".encode("utf-8")
+    ).hexdigest()
+    return f"summary:{video_id}:{prompt_hash}"
+
+# 긴 한국어 요약 응답을 stdlib json보다 빠른 orjson으로 직렬화
+app = FastAPI(title="yt-summary-api", default_response_class=ORJSONResponse)
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+# 연결/풀 대기는 짧게 끊고, 응답 읽기(긴 요약)와 업로드(Whisper 오디오)는 넉넉하게
+HTTP_TIMEOUT = httpx.Timeout(connect=10, read=120, write=30, pool=5)
+UPLOAD_TIMEOUT = httpx.Timeout(connect=10, read=120, write=120, pool=5)
+
+
+@app.on_event("startup")
+async def create_http_clients():
+    """요청마다 새로 만들지 않고 공유하는 HTTP/OpenAI 클라이언트 생성 (커넥션 풀, TLS 재사용)"""
+    # 키가 없으면 요청마다 실패하는 대신 기동 시점에 바로 실패
+    if not OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY not set")
+    # 시스템/환경 프록시를 무시하도록 httpx 클라이언트를 명시적으로 주입
+    app.state.http = httpx.AsyncClient(
+        http2=True, trust_env=False, timeout=HTTP_TIMEOUT, follow_redirects=True, limits=HTTP_LIMITS
+    )
+    app.state.oai = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=app.state.http)
+    # 스레드에서 실행되는 Whisper 경로 / 동기 엔드포인트용
+    app.state.http_sync = httpx.Client(
+        trust_env=False, timeout=UPLOAD_TIMEOUT, follow_redirects=True, limits=HTTP_LIMITS
+    )
+    app.state.oai_sync = OpenAI(api_key=OPENAI_API_KEY, http_client=app.state.http_sync)
+    # yt-dlp가 추출한 오디오 스트림 URL용 (추출한 IP에 묶이므로 yt-dlp와 같은 프록시 사용)
+    app.state.http_media = httpx.Client(
+        proxy=YOUTUBE_PROXY, trust_env=False, timeout=60, follow_redirects=True, limits=HTTP_LIMITS
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await app.state.http.aclose()
+    app.state.http_sync.close()
+    app.state.http_media.close()
+
 
-app = FastAPI(title="yt-summary-api")
+def get_async_openai_client() -> AsyncOpenAI:
+    """공유 AsyncOpenAI 클라이언트 반환"""
+    return app.state.oai
+
+
+def get_openai_client() -> OpenAI:
+    """공유 동기 OpenAI 클라이언트 반환"""
+    return app.state.oai_sync
 
 app.add_middleware(
     CORSMiddleware,
@@ -63,29 +189,49 @@ app.add_middleware(
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "YT Summary API"}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    hits, misses = DISK_CACHE.stats()
+    return {
+        "hits": hits,
+        "misses": misses,
+        "disk_entries": len(DISK_CACHE),
+        "memory_entries": _memory_cache_size(),
+    }
+
+
+def _package_version(name: str) -> Optional[str]:
+    """패키지를 import하지 않고 설치된 버전 조회"""
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
 @app.get("/version")
-def version():
+async def version():
     return {
         "commit": os.getenv("RENDER_GIT_COMMIT") or os.getenv("GIT_COMMIT") or None,
         "branch": os.getenv("RENDER_GIT_BRANCH") or os.getenv("GIT_BRANCH") or None,
-        "youtube_transcript_api": getattr(yta, "__version__", None),
-        "yt_dlp": getattr(yt_dlp, "__version__", None),
-        "openai": os.getenv("OPENAI_API_KEY") is not None,
-        "features": ["whisper_only"],
+        "youtube_transcript_api": _package_version("youtube-transcript-api"),
+        "yt_dlp": _package_version("yt-dlp"),
+        "openai": OPENAI_API_KEY is not None,
+        "features": ["captions", "whisper"],
     }
 
 
 class SummarizeRequest(BaseModel):
     url: str
+    allow_whisper: bool = True
 
 
 class SummarizeResponse(BaseModel):
@@ -93,6 +239,11 @@ class SummarizeResponse(BaseModel):
     summary: str
 
 
+class BatchSummarizeRequest(BaseModel):
+    urls: list[str]
+    wait: bool = False  # True면 Batch API 대신 즉시 동시 요약해 결과를 바로 반환
+
+
 class ChatRequest(BaseModel):
     message: str
 
@@ -101,94 +252,242 @@ class ChatResponse(BaseModel):
     response: str
 
 
+# watch?v= / shorts / embed / v / live / youtu.be 형식의 11자리 영상 ID 추출
+# 호스트는 URL 맨 앞(스킴/서브도메인만 허용)에 고정하고, ID 뒤에 ID 문자가 더 이어지면 거부
+_YT_RE = re.compile(
+    r"^(?:https?://)?(?:[A-Za-z0-9-]+\.)*"
+    r"(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|shorts/|embed/|v/|live/)|youtu\.be/)"
+    r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+
+
+@lru_cache(maxsize=2048)
 def extract_video_id(youtube_url: str) -> Optional[str]:
-    try:
-        parsed = urlparse(youtube_url)
-        if parsed.netloc in {"www.youtube.com", "youtube.com", "m.youtube.com"}:
-            qs = parse_qs(parsed.query)
-            return qs.get("v", [None])[0]
-        if parsed.netloc in {"youtu.be"}:
-            return parsed.path.lstrip("/") or None
-        return None
-    except Exception:
-        return None
+    m = _YT_RE.match(youtube_url.strip())
+    return m.group(1) if m else None
 
 
 def _apply_optional_proxy_from_env() -> None:
-    proxy = os.getenv("YOUTUBE_PROXY")
-    if proxy:
-        os.environ.setdefault("HTTP_PROXY", proxy)
-        os.environ.setdefault("HTTPS_PROXY", proxy)
-        print(f"🌐 프록시 설정됨: {proxy}")
-
-
-def _with_backoff(callable_fn, *args, **kwargs):
-    delays = [1, 3, 7, 12]
-    last_err = None
-    for delay in [0] + delays:
-        if delay:
-            time.sleep(delay)
-        try:
-            return callable_fn(*args, **kwargs)
-        except Exception as e:
-            msg = str(e)
-            last_err = e
-            print(f"백오프 중 오류 발생: {msg}")
-            
-            # 접근 제한 오류인 경우 즉시 실패
-            if _is_access_restricted_error(msg):
-                print(f"접근 제한 오류 감지, 백오프 중단: {msg}")
-                raise e
-            # 429 오류만 재시도
-            if any(tok in msg for tok in ["Too Many Requests", "429", "sorry/index"]):
-                print(f"429 오류, 재시도 예정: {msg}")
-                continue
-            print(f"기타 오류, 즉시 실패: {msg}")
-            raise
-    raise last_err
+    if YOUTUBE_PROXY:
+        os.environ.setdefault("HTTP_PROXY", YOUTUBE_PROXY)
+        os.environ.setdefault("HTTPS_PROXY", YOUTUBE_PROXY)
+        logger.info("🌐 프록시 설정됨: %s", YOUTUBE_PROXY)
+
+
+# yt-dlp/requests가 환경 프록시를 따르도록 기동 시 한 번만 적용 (공유 httpx 클라이언트는 trust_env=False)
+_apply_optional_proxy_from_env()
+
+
+def _log_backoff_retry(retry_state: RetryCallState) -> None:
+    logger.warning(
+        "429 오류, %.1f초 후 재시도 (%d회 실패): %s",
+        retry_state.next_action.sleep, retry_state.attempt_number, retry_state.outcome.exception(),
+    )
+
+
+_RETRY_AFTER_RE = re.compile(r"retry[-\s]?after[:\s]+(\d+)", re.IGNORECASE)
+BACKOFF_BASE_DELAY = 0.5
+BACKOFF_CAP_DELAY = 12.0
+BACKOFF_MAX_DELAY = 30.0  # Retry-After 힌트를 따를 때의 상한
+BACKOFF_TOTAL_BUDGET = 60.0  # 첫 시도부터 이 시간을 넘겨서는 다시 시도하지 않음
+
+
+def _retry_after_hint(e: BaseException) -> Optional[float]:
+    """오류 메시지에 적힌 Retry-After 값(초) (자막 API는 requests 기반이라 응답 헤더 대신 메시지로 전달됨)"""
+    m = _RETRY_AFTER_RE.search(str(e))
+    return float(m.group(1)) if m else None
+
+
+def _backoff_wait(retry_state: RetryCallState) -> float:
+    """decorrelated jitter 지수 백오프 (이전 대기의 최대 3배 범위에서 무작위), Retry-After 힌트는 최소 대기로 사용"""
+    prev = retry_state.upcoming_sleep or BACKOFF_BASE_DELAY
+    delay = min(BACKOFF_CAP_DELAY, random.uniform(BACKOFF_BASE_DELAY, prev * 3))
+    hint = _retry_after_hint(retry_state.outcome.exception())
+    if hint is not None:
+        delay = max(delay, min(hint, BACKOFF_MAX_DELAY))
+    return delay
+
+
+def _error_status(e: BaseException) -> Optional[int]:
+    """예외에 담긴 HTTP 상태 코드 (OpenAI/httpx 예외, yt-dlp DownloadError의 원인 HTTPError), 없으면 None"""
+    exc_info = getattr(e, "exc_info", None)  # yt-dlp DownloadError는 원래 예외를 exc_info에 보관
+    cause = exc_info[1] if isinstance(exc_info, tuple) and len(exc_info) > 1 else None
+    for err in (e, cause):
+        if isinstance(err, APIStatusError):
+            return err.status_code
+        if isinstance(err, httpx.HTTPStatusError):
+            return err.response.status_code
+        status = getattr(err, "status", None)  # yt_dlp.networking.exceptions.HTTPError
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _should_retry(e: BaseException) -> bool:
+    """자막 없음/비활성화는 재시도해도 소용없으므로 즉시 실패, 그 외 429 계열만 재시도"""
+    if isinstance(e, (TranscriptsDisabled, NoTranscriptFound)):
+        return False
+    if isinstance(e, TooManyRequests):
+        return True
+    status = _error_status(e)
+    if status is not None:
+        return status == 429
+    return _is_429_error(str(e))
+
+
+# 429 계열 오류만 재시도 (마지막 시도 후나 다음 대기가 전체 예산을 넘으면 대기 없이 바로 실패)
+BACKOFF_POLICY = dict(
+    stop=stop_after_attempt(6) | stop_before_delay(BACKOFF_TOTAL_BUDGET),
+    wait=_backoff_wait,
+    retry=retry_if_exception(_should_retry),
+    before_sleep=_log_backoff_retry,
+    reraise=True,
+)
+# 0단계 자막 조회는 빠른 경로일 뿐이므로 짧게 한 번만 재시도 (IP 차단 시 다운로드 단계가 수십 초 늦게 시작되지 않도록)
+CAPTION_BACKOFF_BUDGET = 3.0
+CAPTION_BACKOFF_POLICY = dict(
+    BACKOFF_POLICY,
+    stop=stop_after_attempt(2) | stop_before_delay(CAPTION_BACKOFF_BUDGET),
+)
+
+
+def _with_backoff(callable_fn, *args, policy: dict = BACKOFF_POLICY, **kwargs):
+    """동기 호출용 백오프 재시도 (스레드에서 실행되는 호출에 사용)"""
+    return Retrying(**policy)(callable_fn, *args, **kwargs)
+
+
+_RATE_LIMIT_KEYWORDS = ["Too Many Requests", "429", "sorry/index"]
+# 다른 키워드를 부분 문자열로 포함하는 항목("rate limit", "접근 제한" 등)은 제외.
+# "youtube"/"transcript"/"Client Error"처럼 거의 모든 오류 메시지에 들어가는 단어는 오탐이 나므로 넣지 않음
+_RESTRICTED_KEYWORDS = _RATE_LIMIT_KEYWORDS + [
+    "Sign in to confirm", "bot", "captcha", "verification",
+    "blocked", "forbidden", "access denied", "quota exceeded",
+    "자막 처리 중 오류", "제한", "restricted", "limit",
+]
+_RATE_LIMIT_RE = re.compile("|".join(map(re.escape, _RATE_LIMIT_KEYWORDS)), re.IGNORECASE)
+_RESTRICTED_RE = re.compile("|".join(map(re.escape, _RESTRICTED_KEYWORDS)), re.IGNORECASE)
+
+
+# 비공개/삭제/연령 제한 등 다시 시도하거나 다른 방법을 써도 결과가 같은 영구 실패
+_PERMANENT_FAILURE_RE = re.compile(
+    r"Private video|Video unavailable|has been removed|no longer available|confirm your age|age[- ]restricted|copyright",
+    re.IGNORECASE,
+)
+
+
+class PermanentVideoError(Exception):
+    """비공개/삭제/연령 제한 등으로 영상 자체를 볼 수 없음 (재시도/다른 추출 방법도 소용없음)"""
+
+    def __init__(self, video_id: str):
+        super().__init__(f"영상을 볼 수 없습니다. (비공개/삭제/연령 제한): {video_id}")
+
+
+def _is_permanent_video_error(e: BaseException) -> bool:
+    """영상 자체를 볼 수 없어 남은 추출 단계를 시도할 필요가 없는 오류인지 확인"""
+    return (
+        isinstance(e, (PermanentVideoError, VideoUnavailable, InvalidVideoId))
+        or _PERMANENT_FAILURE_RE.search(str(e)) is not None
+    )
 
 
 def _is_429_error(error_msg: str) -> bool:
     """429 오류인지 확인"""
-    return any(tok in error_msg for tok in ["Too Many Requests", "429", "sorry/index"])
-
-
-def _is_access_restricted_error(error_msg: str) -> bool:
-    """접근 제한 관련 오류인지 확인"""
-    restricted_keywords = [
-        "Too Many Requests", "429", "sorry/index",
-        "Sign in to confirm", "bot", "captcha", "verification",
-        "blocked", "forbidden", "access denied", "rate limit",
-        "quota exceeded", "daily limit", "hourly limit",
-        "Client Error", "youtube", "transcript", "retrieve",
-        "Could not retrieve", "transcript for the video",
-        "YouTube 자막 접근 제한", "자막 처리 중 오류",
-        "접근 제한", "제한", "restricted", "limit"
-    ]
-    error_lower = error_msg.lower()
-    is_restricted = any(keyword.lower() in error_lower for keyword in restricted_keywords)
+    return _RATE_LIMIT_RE.search(error_msg) is not None
+
+
+def _is_access_restricted_error(e: BaseException) -> bool:
+    """접근 제한 관련 오류인지 확인 (타입으로 판별 가능한 경우 메시지 검사 생략)"""
+    if isinstance(e, (TranscriptsDisabled, NoTranscriptFound)):
+        # 자막이 없는 것이지 차단된 것이 아님
+        return False
+    status = _error_status(e)
+    if status is not None:
+        is_restricted = status in (403, 429)
+    else:
+        # 상태 코드를 알 수 없는 예외만 메시지로 판별
+        is_restricted = _RESTRICTED_RE.search(str(e)) is not None
     if is_restricted:
-        print(f"접근 제한 오류 감지: {error_msg}")
+        logger.warning("접근 제한 오류 감지: %s", e)
     return is_restricted
 
 
+class AsyncTokenBucket:
+    """초당 rate개, 최대 burst개까지 요청을 허용하는 비동기 토큰 버킷 (429를 맞기 전에 요청 속도 조절)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# YouTube로 나가는 yt-dlp/Selenium 호출 공용 속도 제한
+_YT_BUCKET = AsyncTokenBucket(rate=float(os.getenv("YT_RATE", "5")), burst=int(os.getenv("YT_BURST", "10")))
+
+
 def _fallback_simple_transcript(video_id: str) -> str:
     """최후의 수단: 간단한 텍스트 반환"""
     return f"죄송합니다. 영상 ID {video_id}의 자막을 추출할 수 없습니다. YouTube의 봇 감지로 인해 일시적으로 접근이 제한되었습니다. 잠시 후 다시 시도해 주세요."
 
 
+# yt-dlp 요청에 돌려 쓰는 User-Agent / 기본 헤더 (호출마다 새로 만들지 않도록 모듈 상수로 둠)
+USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0',
+)
+DURATION_USER_AGENTS = USER_AGENTS + ('Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',)
+STEALTH_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 OPR/106.0.0.0',
+)
+STEALTH_ACCEPT_LANGUAGES = (
+    'en-US,en;q=0.9',
+    'ko-KR,ko;q=0.9,en;q=0.8',
+    'en-GB,en;q=0.9,en-US;q=0.8',
+    'ja-JP,ja;q=0.9,en;q=0.8',
+)
+BASE_HTTP_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+def _with_cookies(ydl_opts: dict) -> dict:
+    """설정된 경우에만 yt-dlp 쿠키 적용: Netscape 쿠키 파일 우선 (브라우저 쿠키 DB 복호화보다 훨씬 가벼움)"""
+    if YTDLP_COOKIES_FILE:
+        ydl_opts['cookiefile'] = YTDLP_COOKIES_FILE
+    elif YTDLP_COOKIES_BROWSER:
+        # 서버에는 보통 브라우저가 없으므로 로컬 개발용
+        ydl_opts['cookiesfrombrowser'] = (YTDLP_COOKIES_BROWSER,)
+    return ydl_opts
+
+
 def _try_alternative_extraction(video_id: str) -> str:
     """대안적 추출 방법 시도"""
     try:
         # 다양한 User-Agent와 URL 조합 시도
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0',
-        ]
-        
         alternative_urls = [
             f"https://m.youtube.com/watch?v={video_id}",
             f"https://youtu.be/{video_id}",
@@ -198,30 +497,24 @@ def _try_alternative_extraction(video_id: str) -> str:
         ]
         
         for url in alternative_urls:
-            for ua in user_agents:
+            for ua in USER_AGENTS:
                 try:
-                    print(f"대안 URL 시도: {url} with {ua[:50]}...")
+                    logger.debug("대안 URL 시도: %s with %.50s...", url, ua)
                     ydl_opts = {
                         'format': 'bestaudio/best',
                         'quiet': True,
                         'no_warnings': True,
                         'extract_flat': True,
                         'retries': 1,
-                        'http_headers': {
-                            'User-Agent': ua,
-                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                            'Accept-Language': 'en-US,en;q=0.5',
-                            'Accept-Encoding': 'gzip, deflate',
-                            'Connection': 'keep-alive',
-                        },
+                        'http_headers': {**BASE_HTTP_HEADERS, 'User-Agent': ua},
                     }
                     
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    with _yt_dlp().YoutubeDL(_with_cookies(ydl_opts)) as ydl:
                         info = ydl.extract_info(url, download=False)
                         if info and info.get('title'):
                             return f"영상 제목: {info.get('title', '알 수 없음')}\n\n죄송합니다. 현재 YouTube의 봇 감지로 인해 자막 추출이 제한되고 있습니다. 영상 제목만 확인할 수 있었습니다. 잠시 후 다시 시도해 주세요."
                 except Exception as e:
-                    print(f"대안 URL {url} with {ua[:30]}... 실패: {str(e)}")
+                    logger.warning("대안 URL %s with %.30s... 실패: %s", url, ua, e)
                     continue
                 
         # 방법 2: 기본 메시지 반환
@@ -231,76 +524,73 @@ def _try_alternative_extraction(video_id: str) -> str:
         return f"죄송합니다. 영상 ID {video_id}의 자막을 추출할 수 없습니다. 오류: {str(e)}"
 
 
+def _duration_cache_key(video_id: str) -> str:
+    """영상 길이 캐시 키"""
+    return f"duration:{video_id}"
+
+
+def _remember_duration(video_id: str, info: dict) -> None:
+    """다운로드 중 yt-dlp가 이미 받아온 영상 길이를 저장 (길이 조회용 YouTube 재요청 방지)"""
+    duration = info.get("duration")
+    if duration:
+        DISK_CACHE.set(_duration_cache_key(video_id), int(duration), expire=DURATION_CACHE_TTL)
+
+
+def get_cached_video_duration(video_id: str) -> Optional[int]:
+    """디스크 캐시에서 영상 길이 조회"""
+    return DISK_CACHE.get(_duration_cache_key(video_id))
+
+
 def get_video_duration(video_id: str) -> int:
     """영상 길이를 초 단위로 가져오기"""
+    if not ENABLE_WHISPER_FALLBACK:
+        return 0
     try:
-        # 다양한 User-Agent 중 랜덤 선택
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
-        ]
-        import random
-        selected_ua = random.choice(user_agents)
-        
         ydl_opts = {
             'quiet': True,
             'no_warnings': True,
             'extract_flat': True,
             'http_headers': {
-                'User-Agent': selected_ua,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
+                **BASE_HTTP_HEADERS,
+                'User-Agent': random.choice(DURATION_USER_AGENTS),
                 'Upgrade-Insecure-Requests': '1',
             },
         }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with _yt_dlp().YoutubeDL(_with_cookies(ydl_opts)) as ydl:
             url = f"https://www.youtube.com/watch?v={video_id}"
             info = ydl.extract_info(url, download=False)
+            _remember_duration(video_id, info)
             duration = info.get('duration', 0)
             return int(duration) if duration else 0
     except Exception as e:
-        print(f"영상 길이 가져오기 실패: {str(e)}")
+        logger.warning("영상 길이 가져오기 실패: %s", e)
         return 0
 
-def _download_audio_with_advanced_stealth(video_id: str) -> str:
-    """고급 스텔스 기법으로 오디오 다운로드 (메모리 최적화)"""
-    temp_dir = tempfile.mkdtemp()
+def _downloaded_filepath(info: dict) -> str:
+    """yt-dlp가 반환한 info에서 실제로 저장된 파일 경로 (폴더 재스캔/확장자 추측 불필요)"""
+    downloads = info.get("requested_downloads") or []
+    if not downloads or not downloads[0].get("filepath"):
+        raise Exception("오디오 파일을 찾을 수 없습니다.")
+    return downloads[0]["filepath"]
+
+
+def _download_audio_with_advanced_stealth(video_id: str, temp_dir: str) -> str:
+    """고급 스텔스 기법으로 temp_dir에 오디오 다운로드 후 파일 경로 반환"""
     try:
-        print(f"🕵️ 고급 스텔스 다운로드 시작: {video_id}")
+        logger.info("🕵️ 고급 스텔스 다운로드 시작: %s", video_id)
         
         # 1. 랜덤 지연 (인간적인 행동 시뮬레이션) - 단축
         time.sleep(random.uniform(0.5, 1.5))
         
-        # 2. 더 정교한 User-Agent 로테이션
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 OPR/106.0.0.0',
-        ]
-        
-        selected_ua = random.choice(user_agents)
+        # 2. User-Agent 로테이션
+        selected_ua = random.choice(STEALTH_USER_AGENTS)
         
         # 3. 더 정교한 헤더 시뮬레이션
         headers = {
             'User-Agent': selected_ua,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': random.choice([
-                'en-US,en;q=0.9',
-                'ko-KR,ko;q=0.9,en;q=0.8',
-                'en-GB,en;q=0.9,en-US;q=0.8',
-                'ja-JP,ja;q=0.9,en;q=0.8'
-            ]),
+            'Accept-Language': random.choice(STEALTH_ACCEPT_LANGUAGES),
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -317,7 +607,7 @@ def _download_audio_with_advanced_stealth(video_id: str) -> str:
         
         # 4. 더 정교한 yt-dlp 설정
         ydl_opts = {
-            'format': 'bestaudio[ext=m4a]/bestaudio[ext=mp3]/bestaudio',
+            'format': 'bestaudio[ext=m4a]/bestaudio',  # 원본 오디오 그대로 (재인코딩 없음)
             'outtmpl': f'{temp_dir}/%(id)s.%(ext)s',
             'noplaylist': True,
             'quiet': True,
@@ -336,94 +626,45 @@ def _download_audio_with_advanced_stealth(video_id: str) -> str:
             'writeinfojson': False,
             'writesubtitles': False,
             'writeautomaticsub': False,
-            # 5. 추가 스텔스 옵션
-            'sleep_interval': random.uniform(1, 3),  # 요청 간 랜덤 지연
-            'max_sleep_interval': 5,
-            'sleep_interval_subtitles': random.uniform(1, 3),
-            'sleep_interval_requests': random.uniform(1, 3),
+            # yt-dlp의 sleep_interval* 는 조각/요청마다 1~3초씩 쉬어 다운로드가 수십 초 늘어나므로 사용하지 않음
+            # (요청 속도는 _YT_BUCKET, 사람 같은 지연은 함수 시작의 1회 지연으로 충분)
         }
         
-        print(f"📥 고급 스텔스 다운로드 시도: https://www.youtube.com/watch?v={video_id}")
+        logger.debug("📥 고급 스텔스 다운로드 시도: https://www.youtube.com/watch?v=%s", video_id)
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with _yt_dlp().YoutubeDL(_with_cookies(ydl_opts)) as ydl:
             url = f"https://www.youtube.com/watch?v={video_id}"
             try:
-                ydl.download([url])
-                print("✅ 고급 스텔스 다운로드 성공!")
+                info = ydl.extract_info(url, download=True)
+                logger.debug("✅ 고급 스텔스 다운로드 성공!")
             except Exception as e:
-                error_msg = str(e)
-                print(f"❌ 고급 스텔스 다운로드 실패: {error_msg}")
-                
-                # 6. 대안 URL 시도
-                alternative_urls = [
-                    f"https://m.youtube.com/watch?v={video_id}",
-                    f"https://youtu.be/{video_id}",
-                    f"https://www.youtube.com/embed/{video_id}",
-                ]
-                
-                for alt_url in alternative_urls:
-                    try:
-                        print(f"🔄 대안 URL 시도: {alt_url}")
-                        ydl.download([alt_url])
-                        print("✅ 대안 URL 다운로드 성공!")
-                        break
-                    except Exception as alt_e:
-                        print(f"❌ 대안 URL {alt_url} 실패: {str(alt_e)}")
-                        continue
-                else:
-                    raise e
-        
-        # 다운로드된 오디오 파일 찾기
-        audio_files = [f for f in os.listdir(temp_dir) if f.endswith(('.wav', '.mp3', '.m4a', '.webm', '.ogg'))]
-        if not audio_files:
-            raise Exception("오디오 파일을 찾을 수 없습니다.")
+                # m.youtube / youtu.be / embed 는 같은 추출기로 같은 결과가 나오므로 재시도하지 않음
+                logger.warning("❌ 고급 스텔스 다운로드 실패: %s", e)
+                raise
+        _remember_duration(video_id, info)
+        audio_path = _downloaded_filepath(info)
         
-        audio_path = os.path.join(temp_dir, audio_files[0])
-        print(f"🎵 오디오 파일 다운로드 완료: {audio_files[0]}")
+        logger.info("🎵 오디오 파일 다운로드 완료: %s", os.path.basename(audio_path))
         
-        # Whisper API로 전사
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not set")
-        
-        print("👂 Whisper로 오디오 전사 시작...")
-        http_client = httpx.Client(trust_env=False, timeout=120, follow_redirects=True)
-        client = OpenAI(api_key=api_key, http_client=http_client)
-        
-        with open(audio_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text",
-                temperature=0.0,
-                language="ko"
-            )
-        
-        print("✨ 고급 스텔스 전사 완료!")
-        return transcript.strip()
+        return audio_path
         
     except Exception as e:
-        print(f"고급 스텔스 처리 중 오류: {str(e)}")
+        logger.warning("고급 스텔스 처리 중 오류: %s", e)
         raise
-    finally:
-        # 임시 파일 정리
-        shutil.rmtree(temp_dir, ignore_errors=True)
 
 def _download_audio_with_selenium(video_id: str) -> str:
     """Selenium을 사용한 실제 브라우저 자동화 (선택적)"""
     try:
-        print(f"🌐 Selenium 브라우저 자동화 시작: {video_id}")
+        logger.debug("🌐 Selenium 브라우저 자동화 시작: %s", video_id)
         
         # Selenium이 설치되어 있는지 확인
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
             from selenium.webdriver.common.by import By
             from selenium.webdriver.support.ui import WebDriverWait
             from selenium.webdriver.support import expected_conditions as EC
             import undetected_chromedriver as uc
         except ImportError:
-            print("❌ Selenium이 설치되지 않음. 일반 방법으로 전환.")
+            logger.warning("❌ Selenium이 설치되지 않음. 일반 방법으로 전환.")
             return None
         
         # Chrome 옵션 설정
@@ -466,54 +707,61 @@ def _download_audio_with_selenium(video_id: str) -> str:
             try:
                 title_element = driver.find_element(By.CSS_SELECTOR, "h1.title yt-formatted-string")
                 title = title_element.text
-                print(f"✅ 영상 제목 추출 성공: {title}")
+                logger.info("✅ 영상 제목 추출 성공: %s", title)
                 
                 # 간단한 요약 생성 (실제로는 Whisper 사용)
                 return f"영상 제목: {title}\n\n죄송합니다. 현재 YouTube의 봇 감지로 인해 자막 추출이 제한되고 있습니다. Selenium을 통한 브라우저 자동화로 영상 제목만 확인할 수 있었습니다. 잠시 후 다시 시도해 주세요."
                 
             except Exception as e:
-                print(f"❌ 제목 추출 실패: {str(e)}")
+                logger.warning("❌ 제목 추출 실패: %s", e)
                 return None
                 
         finally:
             driver.quit()
             
     except Exception as e:
-        print(f"Selenium 자동화 중 오류: {str(e)}")
+        logger.warning("Selenium 자동화 중 오류: %s", e)
         return None
 
-def _download_audio_with_ytdlp(video_id: str) -> str:
-    """yt-dlp로 오디오 다운로드 후 Whisper로 전사 (YouTube API 완전 우회)"""
-    temp_dir = tempfile.mkdtemp()
+# OpenAI 전사 API 업로드 한도 — 이보다 크면 메모리 경로를 포기하고 다른 전략 결과를 사용
+MAX_INMEMORY_AUDIO_BYTES = 25 * 1024 * 1024
+# 한 번의 GET으로 받을 수 있는 포맷 (DASH/HLS 조각 포맷은 제외)
+DIRECT_AUDIO_PROTOCOLS = ("http", "https")
+
+
+def _fetch_audio_into_memory(info: dict) -> tuple[str, bytes]:
+    """yt-dlp가 추출한 직접 오디오 URL을 메모리로 받아 (파일명, 바이트) 반환 (디스크 쓰기/재읽기 없음)"""
+    if info.get("protocol") not in DIRECT_AUDIO_PROTOCOLS:
+        raise Exception(f"직접 받을 수 없는 오디오 포맷입니다: {info.get('protocol')}")
+    buffer = io.BytesIO()
+    # 공유 클라이언트로 요청해 같은 CDN 호스트로의 연결/TLS 핸드셰이크를 재사용
+    with app.state.http_media.stream("GET", info["url"], headers=info.get("http_headers")) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            buffer.write(chunk)
+            if buffer.tell() > MAX_INMEMORY_AUDIO_BYTES:
+                raise Exception("오디오가 너무 커서 메모리로 전송할 수 없습니다.")
+    return f"{info['id']}.{info.get('ext') or 'm4a'}", buffer.getvalue()
+
+
+def _download_audio_with_ytdlp(video_id: str, temp_dir: str) -> tuple[str, bytes]:
+    """yt-dlp로 오디오 URL만 추출해 메모리로 받아 (파일명, 바이트) 반환 (YouTube API 완전 우회, 디스크 미사용)"""
     try:
-        print(f"🎬 Whisper 테스트: {video_id}")
-        
-        # 다양한 User-Agent와 헤더로 봇 감지 우회
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0',
-        ]
-        import random
-        selected_ua = random.choice(user_agents)
+        logger.debug("🎬 Whisper 테스트: %s", video_id)
         
         # 최적화된 yt-dlp 설정으로 시도
         ydl_opts = {
-            'format': 'bestaudio[ext=m4a]/bestaudio[ext=mp3]/bestaudio',  # M4A 우선 (더 빠름)
+            'format': 'bestaudio[abr<=64]/bestaudio[ext=m4a]/bestaudio',  # 음성 인식엔 저비트레이트로 충분 (다운로드량 감소, 재인코딩 없이 전송 가능한 포맷)
             'outtmpl': f'{temp_dir}/%(id)s.%(ext)s',
             'noplaylist': True,
             'quiet': True,
             'retries': 3,  # 재시도 증가
             'fragment_retries': 3,  # 프래그먼트 재시도 증가
             'socket_timeout': 60,  # 소켓 타임아웃 증가
+            # 다양한 User-Agent와 헤더로 봇 감지 우회
             'http_headers': {
-                'User-Agent': selected_ua,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
+                **BASE_HTTP_HEADERS,
+                'User-Agent': random.choice(USER_AGENTS),
                 'Upgrade-Insecure-Requests': '1',
                 'Sec-Fetch-Dest': 'document',
                 'Sec-Fetch-Mode': 'navigate',
@@ -524,6 +772,7 @@ def _download_audio_with_ytdlp(video_id: str) -> str:
                 'youtube': {
                     'skip': ['dash', 'hls'],  # DASH/HLS 스킵으로 더 빠른 다운로드
                     'player_skip': ['webpage'],  # 웹페이지 플레이어 스킵
+                    'player_client': ['ios', 'android', 'web'],  # 봇 감지가 덜한 모바일 클라이언트 우선
                 }
             },
             'writethumbnail': False,  # 썸네일 다운로드 안함
@@ -531,161 +780,544 @@ def _download_audio_with_ytdlp(video_id: str) -> str:
             'writesubtitles': False,  # 자막 다운로드 안함
             'writeautomaticsub': False,  # 자동 자막 다운로드 안함
         }
+        logger.debug("📥 yt-dlp 다운로드 시도: https://www.youtube.com/watch?v=%s", video_id)
         
-        print(f"📥 yt-dlp 다운로드 시도: https://www.youtube.com/watch?v={video_id}")
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with _yt_dlp().YoutubeDL(_with_cookies(ydl_opts)) as ydl:
             url = f"https://www.youtube.com/watch?v={video_id}"
             try:
-                ydl.download([url])
-                print("✅ yt-dlp 다운로드 성공!")
+                info = ydl.extract_info(url, download=False)
+                _remember_duration(video_id, info)
+                logger.debug("✅ yt-dlp 오디오 URL 추출 성공!")
             except Exception as e:
                 error_msg = str(e)
-                print(f"❌ yt-dlp 다운로드 실패: {error_msg}")
+                logger.warning("❌ yt-dlp 다운로드 실패: %s", error_msg)
                 
                 # YouTube 접근 제한인지 확인
-                if any(keyword in error_msg.lower() for keyword in [
-                    'blocked', 'forbidden', 'access denied', 'rate limit', 
-                    'quota exceeded', 'daily limit', 'hourly limit',
-                    'client error', 'youtube', 'transcript', 'retrieve',
-                    'could not retrieve', 'transcript for the video',
-                    '접근 제한', '제한', 'restricted', 'limit', 'bot'
-                ]):
-                    raise Exception(f"YouTube 접근이 제한되었습니다. YouTube의 봇 감지로 인해 Whisper를 통한 오디오 다운로드가 차단되었습니다.")
+                if _is_access_restricted_error(e):
+                    raise Exception("YouTube 접근이 제한되었습니다. YouTube의 봇 감지로 인해 Whisper를 통한 오디오 다운로드가 차단되었습니다.")
                 else:
                     raise Exception(f"오디오 다운로드 중 오류가 발생했습니다: {error_msg}")
         
-        # 다운로드된 오디오 파일 찾기
-        audio_files = [f for f in os.listdir(temp_dir) if f.endswith(('.wav', '.mp3', '.m4a', '.webm', '.ogg'))]
-        if not audio_files:
-            raise Exception("오디오 파일을 찾을 수 없습니다.")
+        audio = _fetch_audio_into_memory(info)
+        logger.info("🎵 오디오 다운로드 완료 (메모리): %s, %d bytes", audio[0], len(audio[1]))
         
-        audio_path = os.path.join(temp_dir, audio_files[0])
-        print(f"🎵 오디오 파일 다운로드 완료: {audio_files[0]}")
-        
-        # Whisper API로 전사
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not set")
-        
-        print("👂 Whisper로 오디오 전사 시작...")
-        http_client = httpx.Client(trust_env=False, timeout=120, follow_redirects=True)
-        client = OpenAI(api_key=api_key, http_client=http_client)
-        
-        with open(audio_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text",
-                temperature=0.0,  # 일관성 있는 결과를 위해 온도 0
-                language="ko"  # 한국어 우선 처리
-            )
-        
-        print("✨ Whisper 전사 완료!")
-        return transcript.strip()
+        return audio
         
     except Exception as e:
-        print(f"Whisper 처리 중 오류: {str(e)}")
+        logger.warning("yt-dlp 다운로드 중 오류: %s", e)
         raise
+
+
+# 전사 모델 (gpt-4o-mini-transcribe: whisper-1 대비 더 빠르고 저렴, 필요 시 env로 교체)
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "gpt-4o-mini-transcribe")
+# 서버 전체 OpenAI 동시 호출 상한 (버스트 시 분당 한도를 넘겨 429가 연쇄되는 것 방지)
+_whisper_semaphore = asyncio.Semaphore(int(os.getenv("WHISPER_CONCURRENCY", "4")))
+_llm_semaphore = asyncio.Semaphore(int(os.getenv("LLM_CONCURRENCY", "8")))
+# 슬롯을 이 시간 안에 얻지 못하면 무한정 줄 세우지 않고 503으로 되돌려 보냄 (과부하 시 백프레셔)
+LLM_QUEUE_TIMEOUT_SEC = float(os.getenv("LLM_QUEUE_TIMEOUT_SEC", "30"))
+LLM_BUSY_RETRY_AFTER = "15"
+
+
+class LLMBusyError(Exception):
+    """LLM 동시 호출 슬롯 대기 시간 초과 (서버 과부하)"""
+
+
+@contextlib.asynccontextmanager
+async def _llm_slot():
+    """서버 전체 LLM 동시 호출 슬롯을 얻어 실행 (LLM_QUEUE_TIMEOUT_SEC 초과 대기 시 LLMBusyError)"""
+    try:
+        await asyncio.wait_for(_llm_semaphore.acquire(), LLM_QUEUE_TIMEOUT_SEC)
+    except asyncio.TimeoutError:
+        raise LLMBusyError("요약 요청이 많아 대기 시간이 초과되었습니다.")
+    try:
+        yield
     finally:
-        # 임시 파일 정리
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        _llm_semaphore.release()
 
 
-def fetch_transcript_text(video_id: str) -> tuple[str, Optional[str]]:
-    """최강 하이브리드 자막 추출: 모든 방법을 순차적으로 시도"""
+def _rate_limited_http_exception(e: Union[RateLimitError, LLMBusyError]) -> HTTPException:
+    """OpenAI 429는 429로, 서버 대기열 포화는 503으로 Retry-After와 함께 전달"""
+    if isinstance(e, LLMBusyError):
+        return HTTPException(
+            status_code=503, detail="요청이 많아 잠시 후 다시 시도해 주세요.", headers={"Retry-After": LLM_BUSY_RETRY_AFTER}
+        )
+    retry_after = e.response.headers.get("retry-after") or "10"
+    return HTTPException(
+        status_code=429, detail="요청이 많아 잠시 후 다시 시도해 주세요.", headers={"Retry-After": retry_after}
+    )
+
+
+def _transcribe_audio_file(audio: Union[str, tuple[str, bytes]]) -> str:
+    """다운로드된 오디오(파일 경로 또는 메모리의 (파일명, 바이트))를 Whisper API로 전사"""
+    client = get_openai_client()
+    
+    logger.info("👂 Whisper로 오디오 전사 시작...")
+    with contextlib.ExitStack() as stack:
+        audio_file = audio if isinstance(audio, tuple) else stack.enter_context(open(audio, "rb"))
+        transcript = client.audio.transcriptions.create(
+            model=WHISPER_MODEL,
+            file=audio_file,
+            response_format="text",
+            temperature=0.0,  # 일관성 있는 결과를 위해 온도 0
+            language="ko"  # 한국어 우선 처리
+        )
     
-    # 1단계: YouTube Data API v3 시도 (가장 안정적)
+    logger.info("✨ Whisper 전사 완료!")
+    return transcript.strip()
+
+
+def _download_worst_audio(video_id: str, temp_dir: str) -> Union[str, tuple[str, bytes]]:
+    """최후 수단: 다른 클라이언트로 가장 작은 오디오 포맷을 받아 메모리 데이터(직접 URL) 또는 파일 경로 반환"""
+    ydl_opts = {
+        'format': 'worstaudio[ext=m4a]/worstaudio',
+        'outtmpl': f'{temp_dir}/%(id)s.%(ext)s',
+        'noplaylist': True,
+        'quiet': True,
+        'retries': 2,
+        'socket_timeout': 60,
+        'extractor_args': {'youtube': {'player_client': ['mweb', 'tv']}},
+    }
+    logger.info("🐢 저음질 대체 다운로드 시도: %s", video_id)
+    with _yt_dlp().YoutubeDL(_with_cookies(ydl_opts)) as ydl:
+        info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+        _remember_duration(video_id, info)
+        # 단일 URL로 받을 수 있으면 디스크를 거치지 않음, 분할(DASH/HLS) 포맷만 yt-dlp로 파일 다운로드
+        if info.get("protocol") in DIRECT_AUDIO_PROTOCOLS:
+            return _fetch_audio_into_memory(info)
+        info = ydl.process_ie_result(info, download=True)
+    return _downloaded_filepath(info)
+
+
+# (다운로드 함수, 결과 출처) — 동시에 경쟁시켜 먼저 성공한 쪽을 사용
+AUDIO_DOWNLOAD_STRATEGIES = [
+    (_download_audio_with_ytdlp, "whisper"),
+    (_download_audio_with_advanced_stealth, "advanced_stealth"),
+]
+# 위 전략이 모두 실패했을 때만 시도
+AUDIO_FALLBACK_STRATEGIES = [
+    (_download_worst_audio, "worstaudio"),
+]
+
+# 자막 출처(_extract_transcript_text가 돌려주는 두 번째 값)별 결과의 "method" 표기, 언어 코드면 YouTube 자막
+TRANSCRIPT_METHODS = {
+    "youtube_api": "YouTube API + AI",
+    "selenium": "Selenium + AI",
+    "alternative": "대안 추출 + AI",
+    **{source: "Whisper + AI" for _, source in AUDIO_DOWNLOAD_STRATEGIES + AUDIO_FALLBACK_STRATEGIES},
+}
+
+
+def _transcript_method(source: Optional[str]) -> str:
+    """자막을 실제로 얻은 방법 (결과 응답의 method 필드)"""
+    return TRANSCRIPT_METHODS.get(source, "YouTube 자막 + AI")
+
+
+def _audio_tmpdir() -> Optional[str]:
+    """오디오 임시 폴더 위치: AUDIO_TMPDIR, 없으면 여유가 충분한 /dev/shm(메모리), 그것도 아니면 시스템 기본값"""
+    configured = os.getenv("AUDIO_TMPDIR")
+    if configured:
+        return configured
+    try:
+        # 컨테이너 기본 /dev/shm(64MB)은 긴 영상 오디오를 담기에 작으므로 여유 공간이 충분할 때만 사용
+        if os.access("/dev/shm", os.W_OK) and shutil.disk_usage("/dev/shm").free >= 512 * 1024 * 1024:
+            return "/dev/shm"
+    except OSError:
+        pass
+    return None
+
+
+AUDIO_TMPDIR = _audio_tmpdir()
+
+# 서버 전체 동시 오디오 다운로드 상한 (영상당 전략 2개가 경쟁하므로 기본값은 영상 3개분)
+_download_semaphore = asyncio.Semaphore(int(os.getenv("DOWNLOAD_CONCURRENCY", "6")))
+
+
+async def _run_download_strategy(download_fn, video_id: str) -> tuple[str, Union[str, tuple[str, bytes]]]:
+    """전용 임시 폴더에서 다운로드 전략 하나를 스레드로 실행, (temp_dir, 오디오 경로 또는 메모리 데이터) 반환"""
+    await _download_semaphore.acquire()
+    try:
+        await _YT_BUCKET.acquire()
+        temp_dir = tempfile.mkdtemp(prefix="ytsum_", dir=AUDIO_TMPDIR)
+        future = asyncio.get_running_loop().run_in_executor(None, download_fn, video_id, temp_dir)
+    except BaseException:
+        _download_semaphore.release()
+        raise
+    # 취소되어도 스레드는 끝까지 실행되므로, 자리는 스레드가 실제로 끝났을 때 반납
+    future.add_done_callback(lambda _: _download_semaphore.release())
     try:
-        print(f"📡 YouTube API로 자막 추출 시도: {video_id}")
-        api_key = os.getenv("YOUTUBE_API_KEY")
-        if api_key:
-            transcript_text = _try_youtube_api(video_id, api_key)
-            if transcript_text:
-                print("✅ YouTube API로 자막 추출 성공!")
-                return transcript_text, "youtube_api"
+        return temp_dir, await asyncio.shield(future)
+    except BaseException:
+        # 취소되어도 스레드는 계속 실행되므로, 스레드가 끝난 뒤 임시 폴더 정리
+        future.add_done_callback(lambda _: shutil.rmtree(temp_dir, ignore_errors=True))
+        raise
+
+
+def _discard_download(task: asyncio.Task) -> None:
+    """선택되지 않은 다운로드 작업 취소 및 결과 정리"""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None:
+        shutil.rmtree(task.result()[0], ignore_errors=True)
+
+
+async def _race_downloads(strategies, video_id: str) -> Optional[tuple[str, str, str]]:
+    """다운로드 전략들을 동시에 실행해 가장 먼저 성공한 (temp_dir, 오디오, 출처) 반환, 전부 실패 시 None"""
+    tasks = {
+        asyncio.create_task(_run_download_strategy(download_fn, video_id)): source
+        for download_fn, source in strategies
+    }
+    pending = set(tasks)
+    winner = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = winner or task
+                elif _is_permanent_video_error(task.exception()):
+                    # 다른 전략도 같은 영상을 받으므로 기다리지 않고 바로 실패
+                    logger.warning("🚫 볼 수 없는 영상: %s", task.exception())
+                    raise PermanentVideoError(video_id)
+                else:
+                    logger.warning("❌ %s 다운로드 실패: %s", tasks[task], task.exception())
+    finally:
+        for task in tasks:
+            if task is not winner:
+                _discard_download(task)
+
+    if winner is None:
+        return None
+    return (*winner.result(), tasks[winner])
+
+
+# ffmpeg가 있으면 업로드 전 16kHz 모노 Opus로 줄이고, 긴 오디오는 구간 분할 후 병렬 전사 (없으면 원본 통째로 전사)
+FFMPEG_PATH = shutil.which("ffmpeg")
+TRANSCRIBE_SPLIT_BYTES = 8 * 1024 * 1024  # 길이를 모를 때 원본 크기 기준 (대략 10분 이상 분량)
+TRANSCRIBE_SPLIT_SECONDS = 600
+TRANSCRIBE_SEGMENT_SECONDS = 300
+TRANSCRIBE_CONCURRENCY = 4
+
+
+async def _transcribe_in_thread(audio: Union[str, tuple[str, bytes]]) -> str:
+    """서버 전체 전사 동시 호출 수를 제한하며 스레드에서 전사"""
+    async with _whisper_semaphore:
+        return await asyncio.to_thread(_transcribe_audio_file, audio)
+
+
+async def _run_ffmpeg(*args: str, stdin: Optional[bytes] = None) -> bytes:
+    """ffmpeg 실행: stdin 바이트를 pipe:0으로 넣고 pipe:1 출력을 반환 (실패 시 stderr를 담아 예외)"""
+    process = await asyncio.create_subprocess_exec(
+        FFMPEG_PATH, "-y", "-loglevel", "error", *args,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate(stdin)
+    if process.returncode != 0:
+        raise Exception(f"ffmpeg 실패: {stderr.decode(errors='ignore').strip()}")
+    return stdout
+
+
+async def _audio_to_file(audio: Union[str, tuple[str, bytes]], temp_dir: str) -> str:
+    """메모리 오디오는 구간 분할(segment 출력은 파일만 가능)용으로 temp_dir에 기록, 파일 경로는 그대로 반환"""
+    if not isinstance(audio, tuple):
+        return audio
+    path = os.path.join(temp_dir, audio[0])
+    await asyncio.to_thread(Path(path).write_bytes, audio[1])
+    return path
+
+
+async def _transcode_for_upload(audio: Union[str, tuple[str, bytes]]) -> tuple[str, bytes]:
+    """16kHz 모노 Opus로 미리 낮춰 인코딩 (업로드 크기 약 1/10), 메모리 오디오는 stdin/stdout 파이프로 디스크를 거치지 않음"""
+    source, stdin = ("pipe:0", audio[1]) if isinstance(audio, tuple) else (audio, None)
+    encoded = await _run_ffmpeg(
+        "-i", source, "-vn", "-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", "12k", "-f", "ogg", "pipe:1",
+        stdin=stdin,
+    )
+    return "upload.ogg", encoded
+
+
+async def _split_audio(source: str, temp_dir: str) -> list[str]:
+    """ffmpeg로 오디오를 재인코딩 없이 TRANSCRIBE_SEGMENT_SECONDS 단위 파일로 분할, 순서대로 경로 반환"""
+    ext = os.path.splitext(source)[1]
+    await _run_ffmpeg(
+        "-i", source, "-f", "segment", "-segment_time", str(TRANSCRIBE_SEGMENT_SECONDS),
+        "-reset_timestamps", "1", "-c", "copy", os.path.join(temp_dir, f"part_%03d{ext}"),
+    )
+    return sorted(str(part) for part in Path(temp_dir).glob(f"part_*{ext}"))
+
+
+async def _transcribe_audio(
+    audio: Union[str, tuple[str, bytes]], temp_dir: str, duration: Optional[int] = None
+) -> str:
+    """짧은 오디오는 한 번에, 긴 오디오는 구간별로 동시에 전사해 순서대로 이어 붙임"""
+    if not FFMPEG_PATH:
+        return await _transcribe_in_thread(audio)
+
+    if duration:
+        long_audio = duration > TRANSCRIBE_SPLIT_SECONDS
+    else:
+        long_audio = (len(audio[1]) if isinstance(audio, tuple) else os.path.getsize(audio)) > TRANSCRIBE_SPLIT_BYTES
+
+    try:
+        audio = await _transcode_for_upload(audio)
     except Exception as e:
-        print(f"❌ YouTube API 실패: {str(e)}")
-    
-    # 2단계: 일반 Whisper 시도 (안정적)
+        logger.warning("⚠️ 오디오 변환 실패, 원본으로 전사: %s", e)
+    if not long_audio:
+        return await _transcribe_in_thread(audio)
+
     try:
-        print(f"🎵 Whisper로 자막 추출 시작: {video_id}")
-        whisper_text = _download_audio_with_ytdlp(video_id)
-        print("✨ Whisper로 자막 추출 완료!")
-        return whisper_text, "whisper"
+        parts = await _split_audio(await _audio_to_file(audio, temp_dir), temp_dir)
     except Exception as e:
-        print(f"❌ Whisper 실패: {str(e)}")
-    
-    # 3단계: 고급 스텔스 Whisper 시도 (선택적)
+        logger.warning("⚠️ 오디오 분할 실패, 통째로 전사: %s", e)
+        return await _transcribe_in_thread(audio)
+
+    logger.info("✂️ 오디오 %d개 구간 병렬 전사", len(parts))
+    semaphore = asyncio.Semaphore(TRANSCRIBE_CONCURRENCY)
+
+    async def transcribe_part(part: str) -> str:
+        async with semaphore:
+            return await _transcribe_in_thread(part)
+
+    texts = await asyncio.gather(*(transcribe_part(part) for part in parts))
+    return " ".join(text for text in texts if text)
+
+
+async def _download_and_transcribe(video_id: str) -> tuple[str, str]:
+    """빠른 다운로드 전략들을 경쟁시키고, 모두 실패하면 대체 전략 시도 후 오디오를 Whisper로 전사"""
+    winner = await _race_downloads(AUDIO_DOWNLOAD_STRATEGIES, video_id)
+    if winner is None:
+        winner = await _race_downloads(AUDIO_FALLBACK_STRATEGIES, video_id)
+    if winner is None:
+        raise Exception("모든 오디오 다운로드 전략이 실패했습니다.")
+
+    temp_dir, audio, source = winner
+    _report_stage(video_id, "transcribe")
+    try:
+        return await _transcribe_audio(audio, temp_dir, get_cached_video_duration(video_id)), source
+    finally:
+        # 임시 파일 정리
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# 모든 추출 방법이 실패한 영상 (잠깐 동안 같은 영상에 대한 수십 초짜리 추출 과정 반복 방지)
+# 일시적 실패(봇 차단, 네트워크/OpenAI 오류 등)와 구분되지 않으므로 짧게, 비공개/삭제/연령 제한은 하루 동안 기억
+NO_TRANSCRIPT_TTL_SEC = int(os.getenv("NO_TRANSCRIPT_TTL_SEC", "60"))
+UNAVAILABLE_VIDEO_TTL_SEC = 86400
+
+
+def _no_transcript_ttu(_video_id: str, failure: tuple[type, str], now: float) -> float:
+    """실패 종류에 따라 음성 캐시 만료 시각 결정"""
+    permanent = failure[0] is PermanentVideoError
+    return now + (UNAVAILABLE_VIDEO_TTL_SEC if permanent else NO_TRANSCRIPT_TTL_SEC)
+
+
+_no_transcript_cache = TLRUCache(maxsize=10_000, ttu=_no_transcript_ttu)
+
+# 같은 작업이 진행 중이면 새로 시작하지 않고 그 결과를 함께 기다림 (동시 요청 중복 제거)
+_inflight: dict[str, asyncio.Task] = {}
+
+# 자막 추출 진행 단계 구독자 (video_id → SSE 스트림별 큐), 추출 작업은 여러 요청이 공유하므로 구독 방식으로 전달
+_progress_listeners: dict[str, set[asyncio.Queue]] = {}
+
+
+def _report_stage(video_id: str, stage: str) -> None:
+    """추출 단계가 바뀌면 그 영상을 구독 중인 SSE 스트림에 알림"""
+    for queue in _progress_listeners.get(video_id, ()):
+        queue.put_nowait(stage)
+
+
+async def _single_flight(key: str, coro_fn):
+    """key별로 진행 중인 작업을 공유 (한 요청이 취소돼도 다른 대기자를 위해 작업은 계속)"""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(coro_fn())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.info("⏳ 진행 중인 동일 작업 대기: %s", key)
+    return await asyncio.shield(task)
+
+
+async def fetch_transcript_text(video_id: str, allow_whisper: bool = True) -> tuple[str, Optional[str]]:
+    """캐시 우선 자막 조회: 없으면 추출 후 디스크 캐시에 저장"""
+    cached = get_cached_transcript(video_id)
+    if cached:
+        logger.info("🚀 디스크 캐시에서 자막 반환: %s", video_id)
+        return cached
+
+    failure = _no_transcript_cache.get(video_id)
+    if failure:
+        logger.info("🚫 최근 추출 실패 영상, 재시도 생략: %s", video_id)
+        error_type, message = failure
+        raise (PermanentVideoError(video_id) if error_type is PermanentVideoError else Exception(message))
+
     try:
-        print(f"🕵️ 고급 스텔스 Whisper로 자막 추출 시작: {video_id}")
-        whisper_text = _download_audio_with_advanced_stealth(video_id)
-        print("✨ 고급 스텔스 Whisper로 자막 추출 완료!")
-        return whisper_text, "advanced_stealth"
+        text, lang_code = await _single_flight(
+            f"transcript:{video_id}:{allow_whisper}",
+            lambda: _extract_transcript_text(video_id, allow_whisper),
+        )
     except Exception as e:
-        print(f"❌ 고급 스텔스 Whisper 실패: {str(e)}")
+        # Whisper를 건너뛴 실패는 다음 요청에서 Whisper로 다시 시도할 수 있도록 기록하지 않음
+        # 예외 객체 대신 (종류, 메시지)만 보관 — traceback이 붙잡는 프레임/오디오 바이트를 캐시 수명 동안 붙잡지 않음
+        permanent = isinstance(e, PermanentVideoError)
+        if allow_whisper or permanent:
+            _no_transcript_cache[video_id] = (PermanentVideoError if permanent else Exception, str(e))
+        raise
+    set_cached_transcript(video_id, text, lang_code)
+    return text, lang_code
+
+
+# 업로더 자막 → 자동 생성 자막 순으로 이 언어들을 우선 찾고, 없으면 아무 언어나 사용 (요약 시 한국어로 번역)
+CAPTION_LANGUAGES = ["ko", "en", "ja", "zh-Hans", "zh-Hant"]
+
+
+def _fetch_youtube_captions(video_id: str) -> tuple[str, str]:
+    """youtube_transcript_api로 영상 자막을 가져와 (본문, 언어 코드) 반환"""
+    transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+    try:
+        transcript = transcript_list.find_transcript(CAPTION_LANGUAGES)
+    except NoTranscriptFound:
+        transcript = next(iter(transcript_list))
+    text = " ".join(part["text"] for part in transcript.fetch() if part.get("text"))
+    return text, transcript.language_code
+
+
+async def _extract_transcript_text(video_id: str, allow_whisper: bool = True) -> tuple[str, Optional[str]]:
+    """최강 하이브리드 자막 추출: 0단계 YouTube 자막 우선, 1·2단계는 동시에, 이후 단계는 순차적으로 시도 (블로킹 호출은 스레드로 위임)"""
     
-    # 4단계: Selenium 브라우저 자동화 시도 (선택적)
+    # 0단계: 업로더/자동 생성 자막이 있으면 다운로드·전사 없이 바로 사용 (대부분 1초 내외)
+    _report_stage(video_id, "captions")
     try:
-        print(f"🌐 Selenium 브라우저 자동화 시도: {video_id}")
-        selenium_text = _download_audio_with_selenium(video_id)
-        if selenium_text:
-            print("✅ Selenium 브라우저 자동화 성공!")
-            return selenium_text, "selenium"
+        logger.info("💬 YouTube 자막 조회: %s", video_id)
+        await _YT_BUCKET.acquire()
+        caption_text, caption_lang = await asyncio.to_thread(
+            _with_backoff, _fetch_youtube_captions, video_id, policy=CAPTION_BACKOFF_POLICY
+        )
+        if caption_text:
+            logger.info("✅ YouTube 자막 사용 (%s)", caption_lang)
+            return caption_text, caption_lang
+    except (TranscriptsDisabled, NoTranscriptFound):
+        logger.info("💬 YouTube 자막 없음, 다른 방법 시도: %s", video_id)
+    except (VideoUnavailable, InvalidVideoId):
+        # 영상 자체를 볼 수 없으면 다운로드/브라우저 단계도 같은 결과이므로 바로 실패
+        logger.warning("🚫 볼 수 없는 영상, 추출 중단: %s", video_id)
+        raise PermanentVideoError(video_id) from None
     except Exception as e:
-        print(f"❌ Selenium 브라우저 자동화 실패: {str(e)}")
+        logger.warning("❌ YouTube 자막 조회 실패: %s", e)
     
-    # 5단계: 대안적 추출 방법 시도
+    # 2단계(오디오 다운로드+Whisper)는 1단계 결과를 기다리지 않고 미리 시작 — 1단계가 성공하면 취소
+    whisper_task = None
+    if allow_whisper and ENABLE_WHISPER_FALLBACK:
+        _report_stage(video_id, "download")
+        whisper_task = asyncio.create_task(_download_and_transcribe(video_id))
     try:
-        print(f"🔄 대안적 추출 방법 시도: {video_id}")
-        alternative_text = _try_alternative_extraction(video_id)
-        if alternative_text and "영상 제목" in alternative_text:
-            print("✅ 대안적 추출 성공!")
-            return alternative_text, "alternative"
-    except Exception as e:
-        print(f"❌ 대안적 추출도 실패: {str(e)}")
+        # 1단계: YouTube Data API v3 시도 (가장 안정적)
+        try:
+            logger.info("📡 YouTube API로 자막 추출 시도: %s", video_id)
+            if YOUTUBE_API_KEY:
+                transcript_text = await _try_youtube_api(video_id, YOUTUBE_API_KEY)
+                if transcript_text:
+                    logger.info("✅ YouTube API로 자막 추출 성공!")
+                    return transcript_text, "youtube_api"
+        except Exception as e:
+            logger.warning("❌ YouTube API 실패: %s", e)
+        
+        # 2단계: 일반/고급 스텔스 다운로드를 동시에 시도하고 먼저 성공한 오디오를 Whisper로 전사
+        try:
+            if whisper_task is None:
+                raise Exception("Whisper 사용이 비활성화됨")
+            logger.info("🎵 Whisper로 자막 추출 대기: %s", video_id)
+            whisper_text, source = await whisper_task
+            logger.info("✨ Whisper로 자막 추출 완료! (%s)", source)
+            return whisper_text, source
+        except PermanentVideoError:
+            raise
+        except Exception as e:
+            logger.warning("❌ Whisper 실패: %s", e)
+    finally:
+        if whisper_task is not None and not whisper_task.done():
+            whisper_task.cancel()
+    
+    # 3·4단계: Selenium과 대안적 추출은 서로 독립적이므로 동시에 시도하고 먼저 성공한 결과 사용
+    _report_stage(video_id, "browser")
+    stages = [asyncio.create_task(_try_selenium_stage(video_id))]
+    if ENABLE_WHISPER_FALLBACK:
+        stages.append(asyncio.create_task(_try_alternative_stage(video_id)))
+    try:
+        for next_done in asyncio.as_completed(stages):
+            try:
+                result = await next_done
+            except Exception as e:
+                logger.warning("❌ 후순위 추출 실패: %s", e)
+                continue
+            if result:
+                return result
+    finally:
+        for stage in stages:
+            stage.cancel()
     
     # 모든 방법 실패
-    raise Exception(f"🚫 모든 추출 방법이 실패했습니다. YouTube의 봇 감지가 매우 강화되어 일시적으로 접근이 제한되었습니다. 잠시 후 다시 시도해 주세요.")
+    raise Exception("🚫 모든 추출 방법이 실패했습니다. YouTube의 봇 감지가 매우 강화되어 일시적으로 접근이 제한되었습니다. 잠시 후 다시 시도해 주세요.")
+
+async def _try_selenium_stage(video_id: str) -> Optional[tuple[str, str]]:
+    """3단계: Selenium 브라우저 자동화"""
+    logger.info("🌐 Selenium 브라우저 자동화 시도: %s", video_id)
+    await _YT_BUCKET.acquire()
+    selenium_text = await asyncio.to_thread(_download_audio_with_selenium, video_id)
+    if not selenium_text:
+        return None
+    logger.info("✅ Selenium 브라우저 자동화 성공!")
+    return selenium_text, "selenium"
+
 
-def _try_youtube_api(video_id: str, api_key: str) -> Optional[str]:
-    """YouTube Data API v3로 자막 추출 시도"""
+async def _try_alternative_stage(video_id: str) -> Optional[tuple[str, str]]:
+    """4단계: 대안적 추출 (영상 제목을 얻은 경우만 성공으로 간주)"""
+    logger.info("🔄 대안적 추출 방법 시도: %s", video_id)
+    await _YT_BUCKET.acquire()
+    alternative_text = await asyncio.to_thread(_try_alternative_extraction, video_id)
+    if not alternative_text or "영상 제목" not in alternative_text:
+        return None
+    logger.info("✅ 대안적 추출 성공!")
+    return alternative_text, "alternative"
+
+
+async def _try_youtube_api(video_id: str, api_key: str) -> Optional[str]:
+    """YouTube Data API v3로 자막 추출 시도 (공유 AsyncClient 사용, 이벤트 루프 비차단)"""
     try:
-        import requests
+        client = app.state.http
         
-        # 1. 영상 정보 가져오기
-        video_url = f"https://www.googleapis.com/youtube/v3/videos"
+        # 1·2. 영상 정보와 자막 목록은 서로 독립적이므로 동시에 요청 (같은 HTTP/2 커넥션 위에서 다중화)
+        video_url = "https://www.googleapis.com/youtube/v3/videos"
         video_params = {
             'part': 'snippet,contentDetails',
             'id': video_id,
             'key': api_key
         }
+        captions_url = "https://www.googleapis.com/youtube/v3/captions"
+        captions_params = {
+            'part': 'snippet',
+            'videoId': video_id,
+            'key': api_key
+        }
         
-        response = requests.get(video_url, params=video_params, timeout=10)
-        if response.status_code != 200:
+        video_response, captions_response = await asyncio.gather(
+            client.get(video_url, params=video_params, timeout=10),
+            client.get(captions_url, params=captions_params, timeout=10),
+        )
+        if video_response.status_code != 200 or captions_response.status_code != 200:
             return None
             
-        video_data = response.json()
+        video_data = video_response.json()
         if not video_data.get('items'):
             return None
             
         video_info = video_data['items'][0]
         title = video_info['snippet']['title']
-        duration = video_info['contentDetails']['duration']
-        
-        # 2. 자막 목록 가져오기
-        captions_url = f"https://www.googleapis.com/youtube/v3/captions"
-        captions_params = {
-            'part': 'snippet',
-            'videoId': video_id,
-            'key': api_key
-        }
+        duration_seconds = _parse_duration(video_info['contentDetails']['duration'])
+        # 이미 받은 길이를 저장해 두면 이후 영상 길이용 yt-dlp 조회를 건너뜀
+        _remember_duration(video_id, {"duration": duration_seconds})
         
-        response = requests.get(captions_url, params=captions_params, timeout=10)
-        if response.status_code != 200:
-            return None
-            
-        captions_data = response.json()
+        captions_data = captions_response.json()
         if not captions_data.get('items'):
             return None
             
@@ -708,17 +1340,18 @@ def _try_youtube_api(video_id: str, api_key: str) -> Optional[str]:
             
         # 4. 자막 내용 다운로드 (실제로는 더 복잡한 과정 필요)
         # 여기서는 간단히 제목과 길이만 반환
-        duration_seconds = _parse_duration(duration)
         return f"영상 제목: {title}\n영상 길이: {duration_seconds}초\n\n죄송합니다. YouTube API로는 자막 내용을 직접 가져올 수 없습니다. Whisper 방법을 시도합니다."
         
     except Exception as e:
-        print(f"YouTube API 오류: {str(e)}")
+        logger.warning("YouTube API 오류: %s", e)
         return None
 
+_ISO_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+
 def _parse_duration(duration: str) -> int:
     """ISO 8601 duration을 초 단위로 변환"""
-    import re
-    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration)
+    match = _ISO_DURATION_RE.match(duration)
     if not match:
         return 0
     
@@ -729,171 +1362,660 @@ def _parse_duration(duration: str) -> int:
     return hours * 3600 + minutes * 60 + seconds
 
 
-def summarize_with_openai(transcript_text: str, lang_code: Optional[str]) -> str:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY not set")
+SUMMARY_MODEL = "gpt-4o-mini"
 
-    # 시스템/환경 프록시를 무시하도록 httpx 클라이언트를 명시적으로 주입
-    http_client = httpx.Client(trust_env=False, timeout=60, follow_redirects=True)
-    client = OpenAI(api_key=api_key, http_client=http_client)
-
-    # 입력 길이 방어
-    max_chars = 16000
-    if len(transcript_text) > max_chars:
-        head = transcript_text[:12000]
-        tail = transcript_text[-3000:]
-        transcript_text = head + "\n...\n" + tail
-
-    system_prompt = (
-        "당신은 유튜브 영상 자막을 한국어로 구조화해 주는 비즈니스 전문가입니다. "
-        "간결하고 객관적인 정보 중심 문체를 사용하고, 번역투를 피하며 과도한 구어체는 지양하세요. "
-        "불필요한 장식(굵게, 태그 등)은 쓰지 말고 핵심만 담습니다. "
-        "각 섹션 사이에는 빈 줄 한 줄을 넣어 가독성을 높이세요.\n\n"
-        "형식:\n"
-        "1) 제목: <영상 주제 한 줄>\n\n"
-        "2) 핵심 주제: <이 영상을 관통하는 한 줄 핵심>\n\n"
-        "3) 내용:\n   - <2~3개의 짧은 단락으로, 문장 사이가 자연스럽게 이어지도록 연결어를 활용해 설명>\n   - <콘텐츠에 '세 가지/N가지 방법·접근·전략'이 등장하면, 각 항목을 간단 설명과 함께 소개>\n\n"
-        "4) 핵심 인사이트:\n   - <불릿 5~8개, 실행/판단에 도움이 되는 포인트>\n\n"
-        "5) 3줄 요약:\n   1) <핵심 한 문장>\n   2) <핵심 한 문장>\n   3) <핵심 한 문장>\n"
-    )
+# 출력 형식 (시스템 프롬프트와 분리해 관리)
+SUMMARY_FORMAT_TEMPLATE = (
+    "1) 제목: <영상 주제 한 줄>\n\n"
+    "2) 핵심 주제: <영상을 관통하는 한 줄>\n\n"
+    "3) 내용:\n   - <짧은 단락 2~3개, 연결어로 자연스럽게>\n   - <'N가지 방법/전략'이 나오면 항목별 한 줄 설명>\n\n"
+    "4) 핵심 인사이트:\n   - <불릿 5~8개, 실행/판단 포인트>\n\n"
+    "5) 3줄 요약:\n   1) <한 문장>\n   2) <한 문장>\n   3) <한 문장>\n"
+)
 
-    if lang_code == "ko":
-        user_prompt = (
-            "다음 자막을 위 형식에 맞춰 한국어로 구조화 요약해 주세요.\n\n"
-            f"자막:\n{transcript_text}"
-        )
-    else:
-        user_prompt = (
-            "다음 자막이 영어이거나 혼합어일 수 있습니다. 내용을 한국어로 자연스럽게 번역한 뒤, "
-            "위 형식에 맞춰 구조화 요약해 주세요.\n\n"
-            f"자막:\n{transcript_text}"
+SUMMARY_SYSTEM_PROMPT = (
+    "역할: 유튜브 자막을 한국어로 구조화하는 비즈니스 전문가.\n"
+    "규칙: 간결·객관적 정보 중심, 번역투·과도한 구어체 금지, 굵게·태그 등 장식 금지, 섹션 사이 빈 줄 하나.\n\n"
+    "형식:\n" + SUMMARY_FORMAT_TEMPLATE
+)
+
+
+# 토큰 예산: 이 이하이면 한 번에 요약, 넘으면 청크로 나눠 압축(map) 후 요약(reduce)
+SUMMARY_INPUT_TOKEN_BUDGET = 12000
+CHUNK_TOKENS = 3500
+CHUNK_OVERLAP_TOKENS = 200
+MAX_REDUCE_ROUNDS = 2
+# 청크 압축(map) 동시 호출 수 상한 (OpenAI 레이트 리밋 보호)
+CHUNK_CONCURRENCY = 5
+_chunk_semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+CHUNK_COMPRESS_PROMPT = (
+    "다음은 긴 유튜브 자막의 한 구간입니다. 핵심 사실, 주장, 수치, 예시, 'N가지 방법/전략' 항목만 "
+    "원문 의미를 살려 간결한 메모로 추출하세요. 인사말·잡담·반복은 버리고, 한국어로 작성하세요."
+)
+
+# 자막 사전 압축: 효과음 표기, 말더듬 반복, 군말 제거 (API 호출 없이 입력 토큰 절감)
+_SOUND_CUE_RE = re.compile(r"[\[(](?:music|applause|laughter|음악|박수|웃음)[\])]", re.IGNORECASE)
+_STUTTER_RE = re.compile(r"\b(\w+)(?:\s+\1\b){2,}")
+_FILLER_RE = re.compile(r"(?<!\S)(?:uh+|um+|erm|hmm+|음+|으음|어+)[,.]?(?!\S)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _compact_transcript(text: str) -> str:
+    """효과음/군말/말더듬을 정규식으로 제거하고 공백을 정리"""
+    text = _SOUND_CUE_RE.sub(" ", text)
+    text = _STUTTER_RE.sub(r"\1", text)
+    text = _FILLER_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?。？！])\s+|\n+")
+
+
+# 성공한 인코더만 보관하고, 실패(일시적 다운로드 오류 등)는 이 간격이 지나면 다시 시도
+TOKEN_ENCODER_RETRY_SEC = 300
+_token_encoder = None
+_token_encoder_failed_at: Optional[float] = None
+
+
+def _get_token_encoder():
+    """tiktoken 인코더 (미설치/다운로드 실패 시 None → 글자 수로 근사)"""
+    global _token_encoder, _token_encoder_failed_at
+    if _token_encoder is not None:
+        return _token_encoder
+    if _token_encoder_failed_at is not None and time.monotonic() - _token_encoder_failed_at < TOKEN_ENCODER_RETRY_SEC:
+        return None
+    try:
+        import tiktoken
+        _token_encoder = tiktoken.encoding_for_model(SUMMARY_MODEL)
+        return _token_encoder
+    except Exception as e:
+        _token_encoder_failed_at = time.monotonic()
+        logger.warning("⚠️ tiktoken 사용 불가, 글자 수 기준으로 대체: %s", e)
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    encoder = _get_token_encoder()
+    return len(encoder.encode(text)) if encoder else len(text)
+
+
+def _split_by_tokens(text: str, max_tokens: int) -> list[str]:
+    """문장 경계가 없는 긴 텍스트를 토큰 수 기준으로 강제 분할"""
+    encoder = _get_token_encoder()
+    if encoder is None:
+        return [text[i:i + max_tokens] for i in range(0, len(text), max_tokens)]
+    ids = encoder.encode(text)
+    return [encoder.decode(ids[i:i + max_tokens]) for i in range(0, len(ids), max_tokens)]
+
+
+def _split_transcript(text: str, max_tokens: int = CHUNK_TOKENS, overlap_tokens: int = CHUNK_OVERLAP_TOKENS) -> list[str]:
+    """문장 경계 기준으로 max_tokens 이하 청크로 분할 (앞 청크 끝 문장을 overlap_tokens만큼 겹침)"""
+    sentences = []
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        size = _count_tokens(sentence)
+        if size > max_tokens:
+            sentences.extend((part, _count_tokens(part)) for part in _split_by_tokens(sentence, max_tokens))
+        else:
+            sentences.append((sentence, size))
+
+    # current_tokens는 이어 붙일 공백까지 센 크기 (글자 수 근사 모드에서도 max_tokens를 넘지 않도록)
+    chunks = []
+    current, current_tokens = [], 0
+    for sentence, size in sentences:
+        if current and current_tokens + 1 + size > max_tokens:
+            chunks.append(" ".join(s for s, _ in current))
+            # 문맥 유지를 위해 끝 문장 일부를 다음 청크로 이어감
+            carry, carry_tokens = [], 0
+            for prev in reversed(current):
+                with_prev = prev[1] + (carry_tokens + 1 if carry else 0)
+                if with_prev > overlap_tokens or with_prev + 1 + size > max_tokens:
+                    break
+                carry.insert(0, prev)
+                carry_tokens = with_prev
+            current, current_tokens = carry, carry_tokens
+        current_tokens += size + (1 if current else 0)
+        current.append((sentence, size))
+    if current:
+        chunks.append(" ".join(s for s, _ in current))
+    return chunks or [text]
+
+
+async def _compress_chunk(chunk: str) -> str:
+    """청크 하나를 핵심 메모로 압축 (map 단계)"""
+    client = get_async_openai_client()
+    async with _chunk_semaphore, _llm_slot():
+        completion = await client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": CHUNK_COMPRESS_PROMPT},
+                {"role": "user", "content": chunk},
+            ],
+            temperature=0.0,
         )
+    return completion.choices[0].message.content.strip()
 
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=0.3,
-    )
+
+async def _condense_transcript(transcript_text: str) -> str:
+    """토큰 예산을 넘는 자막은 청크별로 병렬 압축해, 중간 내용 손실 없이 예산 안으로 줄임"""
+    # 토큰화/분할은 긴 자막에서 수백 ms가 걸리므로 이벤트 루프 밖(스레드)에서 실행
+    if await asyncio.to_thread(_count_tokens, transcript_text) <= SUMMARY_INPUT_TOKEN_BUDGET:
+        return transcript_text
+
+    text = transcript_text
+    for _ in range(MAX_REDUCE_ROUNDS):
+        chunks = await asyncio.to_thread(_split_transcript, text)
+        logger.info("✂️ 긴 자막 분할 요약: %s개 청크", len(chunks))
+        partials = await asyncio.gather(*(_compress_chunk(chunk) for chunk in chunks))
+        text = "\n".join(partials)
+        if await asyncio.to_thread(_count_tokens, text) <= SUMMARY_INPUT_TOKEN_BUDGET:
+            break
+    return text
+
+
+# 사용자 메시지 앞부분도 상수로 고정 (시스템 프롬프트와 함께 매 요청 동일한 접두부 → 프롬프트 캐싱)
+SUMMARY_USER_PREAMBLE_KO = "다음 자막을 위 형식에 맞춰 한국어로 구조화 요약해 주세요."
+SUMMARY_USER_PREAMBLE_OTHER = (
+    "다음 자막이 영어이거나 혼합어일 수 있습니다. 내용을 한국어로 자연스럽게 번역한 뒤, "
+    "위 형식에 맞춰 구조화 요약해 주세요."
+)
+
+
+async def _build_summary_messages(transcript_text: str, lang_code: Optional[str]) -> list[dict]:
+    """요약 요청 메시지 구성 (토큰 예산 초과 시 map-reduce 압축 포함)"""
+    return _summary_messages(await _condense_transcript(_compact_transcript(transcript_text)), lang_code)
+
+
+def _summary_messages(transcript_text: str, lang_code: Optional[str]) -> list[dict]:
+    """이미 정리된 자막으로 시스템/사용자 메시지 구성 (API 호출 없음)"""
+    preamble = SUMMARY_USER_PREAMBLE_KO if lang_code == "ko" else SUMMARY_USER_PREAMBLE_OTHER
+    user_prompt = f"{preamble}\n\n자막:\n{transcript_text}"
+
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+async def summarize_with_openai(transcript_text: str, lang_code: Optional[str]) -> str:
+    client = get_async_openai_client()
+
+    messages = await _build_summary_messages(transcript_text, lang_code)
+    async with _llm_slot():
+        completion = await client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=messages,
+            temperature=0.3,
+        )
 
     return completion.choices[0].message.content.strip()
 
 
-@app.post("/summarize", response_model=SummarizeResponse)
-def summarize(req: SummarizeRequest):
-    video_id = extract_video_id(req.url)
-    if not video_id:
-        raise HTTPException(status_code=400, detail="유효한 유튜브 링크가 아닙니다.")
+_STREAM_END = object()
+
+
+async def _stream_completion(**request):
+    """OpenAI 스트리밍 응답의 텍스트 조각을 yield (LLM 슬롯은 업스트림을 읽는 동안만 잡고, 느린 클라이언트 전송은 큐가 흡수)"""
+    client = get_async_openai_client()
+    deltas = asyncio.Queue()
+
+    async def pump():
+        async with _llm_slot():
+            stream = await client.chat.completions.create(stream=True, **request)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    deltas.put_nowait(chunk.choices[0].delta.content)
+
+    producer = asyncio.create_task(pump())
+    producer.add_done_callback(lambda _: deltas.put_nowait(_STREAM_END))
+    try:
+        while (delta := await deltas.get()) is not _STREAM_END:
+            yield delta
+        # 업스트림 오류(429/503 등)는 받은 조각을 모두 전달한 뒤 그대로 전파
+        await producer
+    finally:
+        producer.cancel()
+
+
+async def stream_summary_with_openai(transcript_text: str, lang_code: Optional[str]):
+    """요약을 토큰 단위로 스트리밍 (생성되는 대로 텍스트 조각을 yield)"""
+    messages = await _build_summary_messages(transcript_text, lang_code)
+    async for delta in _stream_completion(model=SUMMARY_MODEL, messages=messages, temperature=0.3):
+        yield delta
+
+
+def _sse_event(data: dict, event: Optional[str] = None) -> str:
+    """SSE 이벤트 문자열 생성 (줄바꿈이 포함된 텍스트도 안전하게 JSON으로 인코딩)"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode()}\n\n"
+
+
+def _sse_error_event(status: int, detail: str, **extra) -> str:
+    """모든 스트림 공통 error 이벤트 ({"status", "detail"} 형태, 필요 시 retry_after 등 추가 필드)"""
+    return _sse_event({"status": status, "detail": detail, **extra}, event="error")
+
+
+def _rate_limited_sse_event(e: Union[RateLimitError, LLMBusyError]) -> str:
+    """스트리밍이 시작된 뒤에는 상태 코드/헤더를 바꿀 수 없으므로 429/503을 error 이벤트로 전달"""
+    error = _rate_limited_http_exception(e)
+    return _sse_error_event(error.status_code, error.detail, retry_after=error.headers["Retry-After"])
+
+
+async def _summarize_cached(video_id: str, transcript_text: str, lang_code: Optional[str]) -> str:
+    """(video_id, 프롬프트 해시) 기준 요약 캐시 조회 후, 없으면 OpenAI로 요약"""
+    cache_key = get_summary_cache_key(video_id, lang_code)
+    summary = DISK_CACHE.get(cache_key)
+    if summary is not None:
+        logger.info("🚀 디스크 캐시에서 요약 반환: %s", video_id)
+        return summary
+
+    summary = await _single_flight(cache_key, lambda: summarize_with_openai(transcript_text, lang_code))
+    DISK_CACHE.set(cache_key, summary, expire=SUMMARY_CACHE_TTL)
+    return summary
+
+
+async def _fetch_transcript_or_http_error(video_id: str, allow_whisper: bool = True) -> tuple[str, Optional[str]]:
+    """자막 조회, 실패는 엔드포인트 공통 HTTP 오류(404/500)로 변환"""
     try:
-        text, lang_code = fetch_transcript_text(video_id)
+        return await fetch_transcript_text(video_id, allow_whisper)
     except (TranscriptsDisabled, NoTranscriptFound):
         raise HTTPException(status_code=404, detail="해당 영상에서 자막을 찾을 수 없습니다.")
+    except PermanentVideoError:
+        raise HTTPException(status_code=404, detail="영상을 볼 수 없습니다. (비공개/삭제/연령 제한)")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"자막 처리 중 오류: {str(e)}")
 
+
+async def _summarize_or_http_error(video_id: str, text: str, lang_code: Optional[str]) -> str:
+    """요약 생성, 실패는 엔드포인트 공통 HTTP 오류(429/503/500)로 변환"""
     try:
-        summary = summarize_with_openai(text, lang_code)
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return await _summarize_cached(video_id, text, lang_code)
+    except (RateLimitError, LLMBusyError) as e:
+        raise _rate_limited_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"요약 중 오류: {str(e)}")
 
+
+@app.post("/summarize", response_model=SummarizeResponse)
+async def summarize(req: SummarizeRequest):
+    video_id = extract_video_id(req.url)
+    if not video_id:
+        raise HTTPException(status_code=400, detail="유효한 유튜브 링크가 아닙니다.")
+    text, lang_code = await _fetch_transcript_or_http_error(video_id, req.allow_whisper)
+    summary = await _summarize_or_http_error(video_id, text, lang_code)
     return SummarizeResponse(language=lang_code, summary=summary)
 
 
+async def _summary_delta_events(video_id: str, text: str, lang_code: Optional[str], parts: list[str]):
+    """캐시된 요약은 한 번에, 없으면 토큰 단위로 delta 이벤트를 내보내며 parts에 누적 (생성 완료 시 요약 캐시 저장)"""
+    cache_key = get_summary_cache_key(video_id, lang_code)
+    cached_summary = DISK_CACHE.get(cache_key)
+    if cached_summary is not None:
+        parts.append(cached_summary)
+        yield _sse_event({"delta": cached_summary})
+        return
+    async for delta in stream_summary_with_openai(text, lang_code):
+        parts.append(delta)
+        yield _sse_event({"delta": delta})
+    DISK_CACHE.set(cache_key, "".join(parts).strip(), expire=SUMMARY_CACHE_TTL)
+
+
+async def _stream_summary_response(video_id: str, allow_whisper: bool = True) -> StreamingResponse:
+    """자막 추출 후 요약을 SSE로 스트리밍하는 응답 생성 (캐시된 요약은 한 번에 전송)"""
+    text, lang_code = await _fetch_transcript_or_http_error(video_id, allow_whisper)
+
+    async def event_stream():
+        try:
+            async for event in _summary_delta_events(video_id, text, lang_code, []):
+                yield event
+        except (RateLimitError, LLMBusyError) as e:
+            yield _rate_limited_sse_event(e)
+            return
+        except Exception as e:
+            yield _sse_error_event(500, f"요약 중 오류: {str(e)}")
+            return
+        yield _sse_event({"language": lang_code}, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/summarize/stream")
+async def summarize_stream(req: SummarizeRequest):
+    """요약을 SSE(text/event-stream)로 스트리밍하는 엔드포인트 (첫 토큰까지의 대기 시간 단축)"""
+    video_id = extract_video_id(req.url)
+    if not video_id:
+        raise HTTPException(status_code=400, detail="유효한 유튜브 링크가 아닙니다.")
+    return await _stream_summary_response(video_id, req.allow_whisper)
+
+
+@app.post("/summarize/{video_id}/stream")
+async def summarize_by_id_stream(video_id: str):
+    """/summarize/{video_id}의 스트리밍 버전: 진행 단계(progress) → 요약 토큰(delta) → 최종 결과(done)를 SSE로 전송"""
+
+    async def event_stream():
+        cached_result = get_cached_result(video_id)
+        if cached_result:
+            yield _sse_event(cached_result, event="done")
+            return
+
+        yield _sse_event({"stage": "transcript"}, event="progress")
+        # 추출 단계(자막 → 다운로드 → 전사 → 브라우저)를 구독해 진행 이벤트로 중계
+        stages = asyncio.Queue()
+        _progress_listeners.setdefault(video_id, set()).add(stages)
+        fetch = asyncio.create_task(_fetch_transcript_or_http_error(video_id))
+        fetch.add_done_callback(lambda _: stages.put_nowait(None))
+        try:
+            while (stage := await stages.get()) is not None:
+                yield _sse_event({"stage": stage}, event="progress")
+            text, lang_code = await fetch
+        except HTTPException as e:
+            yield _sse_error_event(e.status_code, e.detail)
+            return
+        finally:
+            listeners = _progress_listeners.get(video_id)
+            listeners.discard(stages)
+            if not listeners:
+                _progress_listeners.pop(video_id, None)
+            fetch.cancel()
+
+        # 영상 길이 조회는 요약 스트리밍과 동시에 진행 (결과 캐시에 길이 0이 저장되지 않도록 실제 값 확인)
+        duration_task = asyncio.create_task(_lookup_video_duration(video_id))
+        yield _sse_event({"stage": "summary", "language": lang_code}, event="progress")
+        parts = []
+        try:
+            async for event in _summary_delta_events(video_id, text, lang_code, parts):
+                yield event
+            duration = await duration_task
+        except (RateLimitError, LLMBusyError) as e:
+            yield _rate_limited_sse_event(e)
+            return
+        except Exception as e:
+            yield _sse_error_event(500, f"요약 중 오류: {str(e)}")
+            return
+        finally:
+            duration_task.cancel()
+
+        result = {
+            "summary": "".join(parts).strip(),
+            "language": lang_code,
+            "method": _transcript_method(lang_code),
+            "duration": duration,
+            "estimated_time": estimate_processing_time(duration),
+        }
+        set_cached_result(video_id, result)
+        yield _sse_event(result, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+MAX_BATCH_URLS = 50
+# 배치 한 건 안에서 동시에 처리할 영상 수 (YouTube/OpenAI 레이트 리밋 보호)
+BATCH_CONCURRENCY = 8
+
+
+async def _gather_bounded(semaphore: asyncio.Semaphore, coros):
+    """세마포어로 동시 실행 수를 제한한 gather (예외는 결과로 반환)"""
+    async def run(coro):
+        async with semaphore:
+            return await coro
+    return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
+
+
+async def _summarize_video(video_id: str) -> dict:
+    """영상 하나의 자막 추출 + 요약 (캐시/진행 중 작업 공유 포함)"""
+    text, lang_code = await fetch_transcript_text(video_id)
+    summary = await _summarize_cached(video_id, text, lang_code)
+    return {"language": lang_code, "summary": summary}
+
+
+@app.post("/summarize/batch")
+async def summarize_batch(req: BatchSummarizeRequest):
+    """여러 영상을 OpenAI Batch API로 요약 요청 (비대화형, 50% 저렴, 24시간 내 완료), wait=True면 즉시 동시 요약"""
+    if not req.urls or len(req.urls) > MAX_BATCH_URLS:
+        raise HTTPException(status_code=400, detail=f"URL은 1~{MAX_BATCH_URLS}개까지 요청할 수 있습니다.")
+
+    # failed는 항상 요청한 URL을 키로 사용 (같은 영상의 URL이 여럿이면 처음 것 기준)
+    failed = {}
+    urls_by_id = {}
+    for url in req.urls:
+        video_id = extract_video_id(url)
+        if not video_id:
+            failed[url] = "유효한 유튜브 링크가 아닙니다."
+        else:
+            urls_by_id.setdefault(video_id, url)
+    video_ids = list(urls_by_id)
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    if req.wait:
+        summaries = await _gather_bounded(semaphore, (_summarize_video(video_id) for video_id in video_ids))
+        results = {}
+        for video_id, result in zip(video_ids, summaries):
+            if isinstance(result, Exception):
+                failed[urls_by_id[video_id]] = f"요약 중 오류: {str(result)}"
+            else:
+                results[video_id] = result
+        return {"status": "completed", "results": results, "failed": failed}
+
+    transcripts = await _gather_bounded(semaphore, (fetch_transcript_text(video_id) for video_id in video_ids))
+
+    # 긴 자막도 map-reduce(정가 실시간 호출) 없이 정리만 해서 그대로 배치에 넣음 (Batch 할인 유지, 입력 한도는 모델 컨텍스트)
+    lines = []
+    for video_id, transcript in zip(video_ids, transcripts):
+        if isinstance(transcript, Exception):
+            failed[urls_by_id[video_id]] = f"자막 처리 중 오류: {str(transcript)}"
+            continue
+        text, lang_code = transcript
+        try:
+            messages = _summary_messages(_compact_transcript(text), lang_code)
+        except Exception as e:
+            failed[urls_by_id[video_id]] = f"요약 요청 준비 중 오류: {str(e)}"
+            continue
+        lines.append(orjson.dumps({
+            "custom_id": f"{video_id}|{lang_code}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": SUMMARY_MODEL,
+                "messages": messages,
+                "temperature": 0.3,
+            },
+        }))
+
+    if not lines:
+        raise HTTPException(status_code=404, detail={"message": "요약할 수 있는 영상이 없습니다.", "failed": failed})
+
+    try:
+        client = get_async_openai_client()
+        batch_file = await client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"배치 요청 중 오류: {str(e)}")
+
+    return {"batch_id": batch.id, "status": batch.status, "requested": len(lines), "failed": failed}
+
+
+@app.get("/summarize/batch/{batch_id}")
+async def summarize_batch_result(batch_id: str):
+    """배치 상태 조회, 완료 시 결과를 내려받아 요약 캐시에도 저장"""
+    try:
+        client = get_async_openai_client()
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status != "completed" or not batch.output_file_id:
+            return {"batch_id": batch.id, "status": batch.status}
+        output = await client.files.content(batch.output_file_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"배치 조회 중 오류: {str(e)}")
+
+    results = {}
+    for line in output.content.splitlines():
+        if not line.strip():
+            continue
+        item = orjson.loads(line)
+        video_id, _, lang_code = item["custom_id"].partition("|")
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            results[video_id] = {"error": item.get("error") or response.get("body")}
+            continue
+        summary = response["body"]["choices"][0]["message"]["content"].strip()
+        DISK_CACHE.set(get_summary_cache_key(video_id, lang_code), summary, expire=SUMMARY_CACHE_TTL)
+        results[video_id] = {"language": lang_code, "summary": summary}
+
+    return {"batch_id": batch.id, "status": batch.status, "results": results}
+
+
 @app.post("/summarize/{video_id}")
-def summarize_by_id(video_id: str):
+async def summarize_by_id(video_id: str):
     """비디오 ID로 직접 요약하는 엔드포인트 (WebSocket 없이)"""
     # 캐시에서 결과 확인
     cached_result = get_cached_result(video_id)
     if cached_result:
-        print(f"🚀 캐시에서 결과 반환: {video_id}")
+        logger.info("🚀 캐시에서 결과 반환: %s", video_id)
         return cached_result
-    
-    # 영상 길이 가져오기
-    duration = get_video_duration(video_id)
-    estimated_time = estimate_processing_time(duration)
-    
-    try:
-        text, lang_code = fetch_transcript_text(video_id)
-    except (TranscriptsDisabled, NoTranscriptFound):
-        raise HTTPException(status_code=404, detail="해당 영상에서 자막을 찾을 수 없습니다.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"자막 처리 중 오류: {str(e)}")
 
-    try:
-        summary = summarize_with_openai(text, lang_code)
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"요약 중 오류: {str(e)}")
+    # 같은 영상을 동시에 요청하면 파이프라인 한 번의 결과를 함께 사용
+    return await _single_flight(f"video:{video_id}", lambda: _build_video_result(video_id))
+
+
+async def _lookup_video_duration(video_id: str) -> int:
+    """영상 길이: 다운로드 과정에서 저장된 값을 우선 사용하고, 없을 때만 별도 조회"""
+    duration = get_cached_video_duration(video_id)
+    if duration is None:
+        await _YT_BUCKET.acquire()
+        duration = await asyncio.to_thread(get_video_duration, video_id)
+    return duration
+
+
+async def _build_video_result(video_id: str) -> dict:
+    """자막 추출 → 요약 → 길이/예상 시간까지 포함한 결과를 만들어 캐시에 저장"""
+    text, lang_code = await _fetch_transcript_or_http_error(video_id)
+    # 영상 길이 조회(YouTube)와 요약(OpenAI)은 서로 독립적이므로 동시에 진행
+    summary, duration = await asyncio.gather(
+        _summarize_or_http_error(video_id, text, lang_code),
+        _lookup_video_duration(video_id),
+    )
+    estimated_time = estimate_processing_time(duration)
 
     result = {
         "summary": summary,
         "language": lang_code,
-        "method": "Whisper + AI",
+        "method": _transcript_method(lang_code),
         "duration": duration,
         "estimated_time": estimated_time
     }
     
     # 결과를 캐시에 저장
     set_cached_result(video_id, result)
-    print(f"💾 결과를 캐시에 저장: {video_id}")
+    logger.info("💾 결과를 캐시에 저장: %s", video_id)
     
     return result
 
+# 15분 영상 = 70초, 5분 영상 = 48초 기준으로 선형 보간 (y = ax + b, 계수는 한 번만 계산)
+_ESTIMATE_MIN_SECONDS, _ESTIMATE_MIN_TIME = 300, 48   # 5분 -> 48초
+_ESTIMATE_MAX_SECONDS, _ESTIMATE_MAX_TIME = 900, 70   # 15분 -> 70초
+_ESTIMATE_SLOPE = (_ESTIMATE_MAX_TIME - _ESTIMATE_MIN_TIME) / (_ESTIMATE_MAX_SECONDS - _ESTIMATE_MIN_SECONDS)
+_ESTIMATE_INTERCEPT = _ESTIMATE_MIN_TIME - _ESTIMATE_SLOPE * _ESTIMATE_MIN_SECONDS
+
+
 def estimate_processing_time(duration_seconds: int) -> int:
     """영상 길이에 따른 예상 처리 시간 계산 (초 단위)"""
     if duration_seconds == 0:
         return 60  # 기본값 1분
-    
-    # 15분 영상 = 70초, 5분 영상 = 48초 기준으로 선형 보간
-    # 15분(900초) -> 70초, 5분(300초) -> 48초
-    # y = ax + b 형태로 계산
-    x1, y1 = 300, 48   # 5분 -> 48초
-    x2, y2 = 900, 70   # 15분 -> 70초
-    
-    if duration_seconds <= x1:
+    if duration_seconds <= _ESTIMATE_MIN_SECONDS:
         # 5분 이하: 48초 고정
-        return 48
-    elif duration_seconds >= x2:
+        return _ESTIMATE_MIN_TIME
+    if duration_seconds >= _ESTIMATE_MAX_SECONDS:
         # 15분 이상: 70초 고정
-        return 70
-    else:
-        # 5분~15분 사이: 선형 보간
-        a = (y2 - y1) / (x2 - x1)
-        b = y1 - a * x1
-        estimated = a * duration_seconds + b
-        return int(estimated)
+        return _ESTIMATE_MAX_TIME
+    # 5분~15분 사이: 선형 보간
+    return int(_ESTIMATE_SLOPE * duration_seconds + _ESTIMATE_INTERCEPT)
 
 
 
 
-@app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
-    try:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise HTTPException(status_code=500, detail="OPENAI_API_KEY not set")
+CHAT_SYSTEM_PROMPT = "당신은 도움이 되는 AI 어시스턴트입니다. 한국어로 친절하고 정확하게 답변해주세요."
+CHAT_MODEL = "gpt-4o-mini"
+# 요청마다 같은 dict를 새로 만들지 않도록 시스템 메시지는 읽기 전용으로 한 번만 생성
+_CHAT_SYSTEM_MESSAGE = MappingProxyType({"role": "system", "content": CHAT_SYSTEM_PROMPT})
+# 같은 질문의 반복 호출은 캐시된 답변으로 응답 (0이면 캐시 사용 안 함)
+CHAT_CACHE_TTL_SEC = int(os.getenv("CHAT_CACHE_TTL_SEC", "86400"))
 
-        http_client = httpx.Client(trust_env=False, timeout=60, follow_redirects=True)
-        client = OpenAI(api_key=api_key, http_client=http_client)
 
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 도움이 되는 AI 어시스턴트입니다. 한국어로 친절하고 정확하게 답변해주세요."},
-                {"role": "user", "content": req.message},
-            ],
-            temperature=0.7,
-        )
+def _chat_messages(message: str) -> list:
+    """고정 시스템 메시지 + 사용자 메시지로 대화 요청 메시지 구성"""
+    return [_CHAT_SYSTEM_MESSAGE, {"role": "user", "content": message}]
+
+
+def get_chat_cache_key(message: str) -> str:
+    """모델/시스템 프롬프트/질문이 같을 때만 적중하는 대화 캐시 키"""
+    digest = hashlib.sha256(f"{CHAT_MODEL}|{CHAT_SYSTEM_PROMPT}|{message}".encode("utf-8")).hexdigest()
+    return f"chat:{digest}"
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(req: ChatRequest):
+    cache_key = get_chat_cache_key(req.message)
+    if CHAT_CACHE_TTL_SEC:
+        cached = DISK_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info("🚀 캐시된 대화 응답 반환")
+            return ChatResponse(response=cached)
+    try:
+        client = get_async_openai_client()
+
+        async with _llm_slot():
+            completion = await client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=_chat_messages(req.message),
+                temperature=0.7,
+                timeout=60,
+            )
 
         response = completion.choices[0].message.content.strip()
+        if CHAT_CACHE_TTL_SEC:
+            DISK_CACHE.set(cache_key, response, expire=CHAT_CACHE_TTL_SEC)
         return ChatResponse(response=response)
 
+    except (RateLimitError, LLMBusyError) as e:
+        raise _rate_limited_http_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"대화 중 오류: {str(e)}")
 
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest):
+    """대화 응답을 SSE(text/event-stream)로 토큰 단위 스트리밍 (캐시된 답변은 한 번에 전송)"""
+    cache_key = get_chat_cache_key(req.message)
+    cached = DISK_CACHE.get(cache_key) if CHAT_CACHE_TTL_SEC else None
+
+    async def event_stream():
+        if cached is not None:
+            yield _sse_event({"delta": cached})
+            yield _sse_event({}, event="done")
+            return
+        parts = []
+        try:
+            async for delta in _stream_completion(
+                model=CHAT_MODEL, messages=_chat_messages(req.message), temperature=0.7, timeout=60
+            ):
+                parts.append(delta)
+                yield _sse_event({"delta": delta})
+        except (RateLimitError, LLMBusyError) as e:
+            yield _rate_limited_sse_event(e)
+            return
+        except Exception as e:
+            yield _sse_error_event(500, f"대화 중 오류: {str(e)}")
+            return
+        if CHAT_CACHE_TTL_SEC:
+            DISK_CACHE.set(cache_key, "".join(parts).strip(), expire=CHAT_CACHE_TTL_SEC)
+        yield _sse_event({}, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
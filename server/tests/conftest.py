@@ -0,0 +1,26 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# main은 import 시점에 디스크 캐시를 열고 키를 읽으므로, 테스트 전용 값으로 먼저 설정
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["DISK_CACHE_DIR"] = tempfile.mkdtemp(prefix="ytsum_test_cache_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_async_state(monkeypatch):
+    """모듈 전역 세마포어/버킷은 처음 사용한 이벤트 루프에 묶이므로 테스트마다 새로 만들고, 캐시도 비움"""
+    monkeypatch.setattr(main, "_download_semaphore", asyncio.Semaphore(6))
+    monkeypatch.setattr(main, "_llm_semaphore", asyncio.Semaphore(8))
+    monkeypatch.setattr(main, "_YT_BUCKET", main.AsyncTokenBucket(rate=1000, burst=1000))
+    main._inflight.clear()
+    main.DISK_CACHE.clear()
+    with main._CACHE_LOCK:
+        main.CACHE.clear()
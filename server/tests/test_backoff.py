@@ -0,0 +1,124 @@
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+
+def _run(policy, fn):
+    """실제로 잠들지 않고 정책을 실행해 (시도 횟수, 대기 시간 목록, 결과/예외) 반환"""
+    attempts, sleeps = [], []
+
+    def call():
+        attempts.append(len(attempts) + 1)
+        return fn()
+
+    retrying = main.Retrying(**dict(policy, sleep=sleeps.append, before_sleep=None))
+    try:
+        outcome = retrying(call)
+    except Exception as e:
+        outcome = e
+    return len(attempts), sleeps, outcome
+
+
+def _http_status_error(status):
+    request = httpx.Request("GET", "https://www.youtube.com")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+@pytest.mark.parametrize("error, retry", [
+    (main.TooManyRequests("abcdefghijk"), True),
+    (Exception("429 Client Error: Too Many Requests for url"), True),
+    (Exception("too many requests"), True),
+    (_http_status_error(429), True),
+    (_http_status_error(503), False),
+    (main.NoTranscriptFound("abcdefghijk", [], None), False),
+    (Exception("네트워크 오류"), False),
+])
+def test_should_retry_only_rate_limits(error, retry):
+    assert main._should_retry(error) is retry
+
+
+def test_backoff_policy_gives_up_after_six_attempts_with_bounded_jittered_waits():
+    def rate_limited():
+        raise main.TooManyRequests("abcdefghijk")
+
+    attempts, sleeps, outcome = _run(main.BACKOFF_POLICY, rate_limited)
+    assert attempts == 6
+    assert isinstance(outcome, main.TooManyRequests)
+    assert len(sleeps) == 5
+    assert all(main.BACKOFF_BASE_DELAY <= sleep <= main.BACKOFF_CAP_DELAY for sleep in sleeps)
+
+
+def test_backoff_policy_returns_after_a_transient_rate_limit():
+    results = iter([main.TooManyRequests("abcdefghijk"), "자막"])
+
+    def flaky():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    attempts, sleeps, outcome = _run(main.BACKOFF_POLICY, flaky)
+    assert (attempts, len(sleeps), outcome) == (2, 1, "자막")
+
+
+def test_backoff_policy_fails_immediately_on_non_retryable_errors():
+    def no_captions():
+        raise main.NoTranscriptFound("abcdefghijk", [], None)
+
+    attempts, sleeps, outcome = _run(main.BACKOFF_POLICY, no_captions)
+    assert (attempts, sleeps) == (1, [])
+    assert isinstance(outcome, main.NoTranscriptFound)
+
+
+def test_backoff_wait_honours_retry_after_up_to_the_cap():
+    def retry_after(seconds):
+        def fn():
+            raise Exception(f"429 Too Many Requests, Retry-After: {seconds}")
+        return fn
+
+    _, sleeps, _ = _run(dict(main.BACKOFF_POLICY, stop=main.stop_after_attempt(2)), retry_after(20))
+    assert sleeps == [20.0]
+    _, sleeps, _ = _run(dict(main.BACKOFF_POLICY, stop=main.stop_after_attempt(2)), retry_after(600))
+    assert sleeps == [main.BACKOFF_MAX_DELAY]
+
+
+def test_caption_policy_retries_once_within_a_short_budget():
+    def rate_limited():
+        raise main.TooManyRequests("abcdefghijk")
+
+    attempts, sleeps, _ = _run(main.CAPTION_BACKOFF_POLICY, rate_limited)
+    assert attempts == 2
+    assert sum(sleeps) <= main.CAPTION_BACKOFF_BUDGET
+
+
+def test_caption_rate_limit_falls_through_to_the_download_stage(monkeypatch):
+    caption_calls = []
+
+    def rate_limited(video_id):
+        caption_calls.append(video_id)
+        raise main.TooManyRequests(video_id)
+
+    async def download(video_id):
+        return "전사된 자막", "whisper"
+
+    monkeypatch.setattr(main, "CAPTION_BACKOFF_POLICY", dict(main.CAPTION_BACKOFF_POLICY, sleep=lambda _: None))
+    monkeypatch.setattr(main, "ENABLE_WHISPER_FALLBACK", True)
+    monkeypatch.setattr(main, "YOUTUBE_API_KEY", None)
+    monkeypatch.setattr(main, "_fetch_youtube_captions", rate_limited)
+    monkeypatch.setattr(main, "_download_and_transcribe", download)
+
+    assert asyncio.run(main._extract_transcript_text("abcdefghijk")) == ("전사된 자막", "whisper")
+    assert len(caption_calls) == 2
+
+
+@pytest.mark.parametrize("source, method", [
+    ("ko", "YouTube 자막 + AI"),
+    ("whisper", "Whisper + AI"),
+    ("worstaudio", "Whisper + AI"),
+    ("youtube_api", "YouTube API + AI"),
+])
+def test_transcript_method_reports_the_actual_source(source, method):
+    assert main._transcript_method(source) == method
@@ -0,0 +1,131 @@
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+GOOD_URL = "https://youtu.be/aaaaaaaaaaa"
+BROKEN_URL = "https://www.youtube.com/watch?v=bbbbbbbbbbb"
+
+
+class _FakeBatchOpenAI:
+    """Batch API 파일 업로드/배치 생성/조회를 흉내 내는 OpenAI 대역"""
+
+    def __init__(self, output_lines=()):
+        self.uploaded = None
+        self.output = b"\n".join(orjson.dumps(line) for line in output_lines)
+        self.files = SimpleNamespace(create=self._upload, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+
+    async def _upload(self, file, purpose):
+        self.uploaded = file[1]
+        return SimpleNamespace(id="file-1")
+
+    async def _create_batch(self, **kwargs):
+        return SimpleNamespace(id="batch-1", status="validating")
+
+    async def _retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id="file-out")
+
+    async def _content(self, file_id):
+        return SimpleNamespace(content=self.output)
+
+
+@pytest.fixture
+def transcripts(monkeypatch):
+    """GOOD_URL 영상은 긴 자막, BROKEN_URL 영상은 추출 실패"""
+    async def fetch(video_id, allow_whisper=True):
+        if video_id == "bbbbbbbbbbb":
+            raise Exception("추출 실패")
+        return "음 긴 자막 문장입니다. " * 5000, "ko"
+
+    monkeypatch.setattr(main, "fetch_transcript_text", fetch)
+
+
+def test_batch_submits_compacted_transcripts_without_live_map_reduce(transcripts, monkeypatch):
+    async def must_not_compress(chunk):
+        raise main.LLMBusyError("배치 본문을 만들 때 실시간 호출을 하면 안 됨")
+
+    monkeypatch.setattr(main, "_compress_chunk", must_not_compress)
+    fake_openai = _FakeBatchOpenAI()
+    with TestClient(main.app) as client:
+        main.app.state.oai = fake_openai
+        response = client.post("/summarize/batch", json={"urls": ["not a url", GOOD_URL, BROKEN_URL]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["requested"] == 1
+    assert body["failed"] == {
+        "not a url": "유효한 유튜브 링크가 아닙니다.",
+        BROKEN_URL: "자막 처리 중 오류: 추출 실패",
+    }
+    (line,) = fake_openai.uploaded.splitlines()
+    request = orjson.loads(line)
+    assert request["custom_id"] == "aaaaaaaaaaa|ko"
+    user_prompt = request["body"]["messages"][1]["content"]
+    assert user_prompt.startswith(main.SUMMARY_USER_PREAMBLE_KO)
+    # 군말 제거(_compact_transcript)만 적용하고 압축 없이 자막 전체를 넣음
+    transcript = user_prompt.split("자막:\n", 1)[1]
+    assert transcript == ("긴 자막 문장입니다. " * 5000).strip()
+
+
+def test_batch_deduplicates_urls_for_the_same_video(transcripts):
+    fake_openai = _FakeBatchOpenAI()
+    with TestClient(main.app) as client:
+        main.app.state.oai = fake_openai
+        response = client.post("/summarize/batch", json={"urls": [GOOD_URL, "https://youtube.com/shorts/aaaaaaaaaaa"]})
+    assert response.json()["requested"] == 1
+    assert len(fake_openai.uploaded.splitlines()) == 1
+
+
+def test_batch_rejects_when_nothing_can_be_summarized(transcripts):
+    with TestClient(main.app) as client:
+        response = client.post("/summarize/batch", json={"urls": [BROKEN_URL]})
+    assert response.status_code == 404
+    assert response.json()["detail"]["failed"] == {BROKEN_URL: "자막 처리 중 오류: 추출 실패"}
+
+
+def test_batch_result_caches_completed_summaries():
+    fake_openai = _FakeBatchOpenAI([
+        {
+            "custom_id": "aaaaaaaaaaa|ko",
+            "response": {"status_code": 200, "body": {"choices": [{"message": {"content": " 요약 "}}]}},
+        },
+        {"custom_id": "bbbbbbbbbbb|en", "error": {"message": "실패"}},
+    ])
+    with TestClient(main.app) as client:
+        main.app.state.oai = fake_openai
+        response = client.get("/summarize/batch/batch-1")
+
+    assert response.json()["results"] == {
+        "aaaaaaaaaaa": {"language": "ko", "summary": "요약"},
+        "bbbbbbbbbbb": {"error": {"message": "실패"}},
+    }
+    assert main.DISK_CACHE.get(main.get_summary_cache_key("aaaaaaaaaaa", "ko")) == "요약"
+
+
+def test_batch_wait_returns_successes_and_keys_failures_by_url(transcripts, monkeypatch):
+    async def summarize(video_id, text, lang_code):
+        return f"{video_id} 요약"
+
+    monkeypatch.setattr(main, "_summarize_cached", summarize)
+    with TestClient(main.app) as client:
+        response = client.post("/summarize/batch", json={"wait": True, "urls": ["not a url", GOOD_URL, BROKEN_URL]})
+
+    assert response.json() == {
+        "status": "completed",
+        "results": {"aaaaaaaaaaa": {"language": "ko", "summary": "aaaaaaaaaaa 요약"}},
+        "failed": {
+            "not a url": "유효한 유튜브 링크가 아닙니다.",
+            BROKEN_URL: "요약 중 오류: 추출 실패",
+        },
+    }
+
+
+def test_batch_rejects_empty_and_oversized_requests():
+    with TestClient(main.app) as client:
+        assert client.post("/summarize/batch", json={"urls": []}).status_code == 400
+        too_many = [GOOD_URL] * (main.MAX_BATCH_URLS + 1)
+        assert client.post("/summarize/batch", json={"urls": too_many, "wait": True}).status_code == 400
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+class _FakeChatOpenAI:
+    """일반/스트리밍 대화 응답을 흉내 내고 호출 횟수를 세는 OpenAI 대역"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        if not kwargs.get("stream"):
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f" {self.answer} "))])
+
+        async def stream():
+            for part in (self.answer[:2], self.answer[2:]):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))])
+
+        return stream()
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as test_client:
+        main.app.state.oai = _FakeChatOpenAI("반갑습니다")
+        yield test_client
+
+
+def test_chat_cache_key_depends_on_message_and_model(monkeypatch):
+    key = main.get_chat_cache_key("안녕하세요")
+    assert key == main.get_chat_cache_key("안녕하세요")
+    assert key.startswith("chat:")
+    assert key != main.get_chat_cache_key("안녕")
+    monkeypatch.setattr(main, "CHAT_MODEL", "other-model")
+    assert key != main.get_chat_cache_key("안녕하세요")
+
+
+def test_chat_serves_a_repeated_question_from_cache(client):
+    first = client.post("/chat", json={"message": "안녕하세요"})
+    second = client.post("/chat", json={"message": "안녕하세요"})
+    assert first.json() == second.json() == {"response": "반갑습니다"}
+    assert len(main.app.state.oai.calls) == 1
+
+
+def test_chat_stream_caches_the_joined_answer(client):
+    first = client.post("/chat/stream", json={"message": "안녕하세요"}).text
+    second = client.post("/chat/stream", json={"message": "안녕하세요"}).text
+    assert first.count('"delta"') == 2
+    assert '{"delta":"반갑습니다"}' in second and second.count('"delta"') == 1
+    assert len(main.app.state.oai.calls) == 1
+    assert client.post("/chat", json={"message": "안녕하세요"}).json() == {"response": "반갑습니다"}
+
+
+def test_chat_cache_can_be_disabled(client, monkeypatch):
+    monkeypatch.setattr(main, "CHAT_CACHE_TTL_SEC", 0)
+    client.post("/chat", json={"message": "안녕하세요"})
+    client.post("/chat", json={"message": "안녕하세요"})
+    assert len(main.app.state.oai.calls) == 2
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+import main
+
+
+def test_race_downloads_returns_the_winner_and_cleans_up_the_loser():
+    temp_dirs = {}
+    slow_started = threading.Event()
+    race_done = threading.Event()
+
+    def fast(video_id, temp_dir):
+        slow_started.wait(5)
+        temp_dirs["fast"] = temp_dir
+        return ("fast.m4a", b"audio")
+
+    def slow(video_id, temp_dir):
+        temp_dirs["slow"] = temp_dir
+        slow_started.set()
+        # 승자가 정해진 뒤에 끝나도록 대기 (취소되어도 스레드는 끝까지 실행됨)
+        race_done.wait(5)
+        path = os.path.join(temp_dir, "slow.m4a")
+        with open(path, "wb") as f:
+            f.write(b"audio")
+        return path
+
+    async def run():
+        winner = await main._race_downloads([(fast, "fast"), (slow, "slow")], "abcdefghijk")
+        race_done.set()
+        # 진 쪽 스레드가 끝난 뒤 정리 콜백이 임시 폴더를 지울 때까지 대기
+        while os.path.exists(temp_dirs["slow"]):
+            await asyncio.sleep(0.01)
+        return winner
+
+    temp_dir, audio, source = asyncio.run(asyncio.wait_for(run(), 5))
+    assert source == "fast"
+    assert audio == ("fast.m4a", b"audio")
+    assert temp_dir == temp_dirs["fast"] and os.path.isdir(temp_dir)
+    os.rmdir(temp_dir)
+
+
+def test_race_downloads_returns_none_when_every_strategy_fails():
+    temp_dirs = []
+
+    def failing(video_id, temp_dir):
+        temp_dirs.append(temp_dir)
+        raise Exception("HTTP Error 403: Forbidden")
+
+    async def run():
+        return await main._race_downloads([(failing, "a"), (failing, "b")], "abcdefghijk")
+
+    assert asyncio.run(run()) is None
+    assert len(temp_dirs) == 2
+    assert not any(os.path.exists(path) for path in temp_dirs)
+
+
+def test_race_downloads_fails_fast_on_permanent_error():
+    race_done = threading.Event()
+    slow_finished = threading.Event()
+
+    def private(video_id, temp_dir):
+        raise Exception("ERROR: [youtube] abcdefghijk: Private video. Sign in if you've been granted access")
+
+    def slow(video_id, temp_dir):
+        race_done.wait(5)
+        slow_finished.set()
+        return ("slow.m4a", b"audio")
+
+    async def run():
+        try:
+            await main._race_downloads([(private, "whisper"), (slow, "slow")], "abcdefghijk")
+        except main.PermanentVideoError:
+            # 느린 전략이 끝나기를 기다리지 않고 실패해야 함
+            return slow_finished.is_set()
+        finally:
+            race_done.set()
+
+    assert asyncio.run(asyncio.wait_for(run(), 5)) is False
+
+
+def test_unavailable_video_skips_the_rest_of_the_ladder(monkeypatch):
+    def unavailable(video_id):
+        raise main.VideoUnavailable(video_id)
+
+    async def must_not_download(video_id):
+        raise AssertionError("다운로드 단계까지 가면 안 됨")
+
+    monkeypatch.setattr(main, "ENABLE_WHISPER_FALLBACK", True)
+    monkeypatch.setattr(main, "_fetch_youtube_captions", unavailable)
+    monkeypatch.setattr(main, "_download_and_transcribe", must_not_download)
+
+    with pytest.raises(main.PermanentVideoError):
+        asyncio.run(main._extract_transcript_text("abcdefghijk"))
+
+
+def test_permanent_video_error_maps_to_404(monkeypatch):
+    async def unavailable(video_id, allow_whisper=True):
+        raise main.PermanentVideoError(video_id)
+
+    monkeypatch.setattr(main, "fetch_transcript_text", unavailable)
+    with pytest.raises(main.HTTPException) as error:
+        asyncio.run(main._fetch_transcript_or_http_error("abcdefghijk"))
+    assert error.value.status_code == 404
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from cachetools import TLRUCache
+
+import main
+
+
+@pytest.fixture
+def negative_cache(monkeypatch):
+    """가짜 시계를 쓰는 음성 캐시 (clock[0]을 움직여 만료 확인)"""
+    clock = [0.0]
+    cache = TLRUCache(maxsize=100, ttu=main._no_transcript_ttu, timer=lambda: clock[0])
+    monkeypatch.setattr(main, "_no_transcript_cache", cache)
+    return clock
+
+
+def test_negative_cache_skips_extraction_until_expiry(monkeypatch, negative_cache):
+    calls = 0
+
+    async def failing_extract(video_id, allow_whisper=True):
+        nonlocal calls
+        calls += 1
+        raise Exception("모든 추출 방법이 실패했습니다.")
+
+    monkeypatch.setattr(main, "_extract_transcript_text", failing_extract)
+
+    async def fetch():
+        with pytest.raises(Exception, match="모든 추출 방법이 실패했습니다."):
+            await main.fetch_transcript_text("abcdefghijk")
+
+    asyncio.run(fetch())
+    asyncio.run(fetch())
+    assert calls == 1
+
+    negative_cache[0] += main.NO_TRANSCRIPT_TTL_SEC + 1
+    asyncio.run(fetch())
+    assert calls == 2
+
+
+def test_negative_cache_keeps_permanent_failures_longer(monkeypatch, negative_cache):
+    calls = 0
+
+    async def unavailable(video_id, allow_whisper=True):
+        nonlocal calls
+        calls += 1
+        raise main.PermanentVideoError(video_id)
+
+    monkeypatch.setattr(main, "_extract_transcript_text", unavailable)
+
+    async def fetch():
+        with pytest.raises(main.PermanentVideoError):
+            await main.fetch_transcript_text("abcdefghijk")
+
+    asyncio.run(fetch())
+    negative_cache[0] += main.NO_TRANSCRIPT_TTL_SEC + 1
+    asyncio.run(fetch())
+    assert calls == 1
+
+    negative_cache[0] += main.UNAVAILABLE_VIDEO_TTL_SEC
+    asyncio.run(fetch())
+    assert calls == 2
+
+
+def test_negative_cache_stores_no_exception_objects(monkeypatch, negative_cache):
+    async def failing_extract(video_id, allow_whisper=True):
+        raise Exception("boom")
+
+    monkeypatch.setattr(main, "_extract_transcript_text", failing_extract)
+    with pytest.raises(Exception):
+        asyncio.run(main.fetch_transcript_text("abcdefghijk"))
+    assert main._no_transcript_cache["abcdefghijk"] == (Exception, "boom")
+
+
+def test_failures_without_whisper_are_not_negative_cached(monkeypatch, negative_cache):
+    async def failing_extract(video_id, allow_whisper=True):
+        raise Exception("boom")
+
+    monkeypatch.setattr(main, "_extract_transcript_text", failing_extract)
+    with pytest.raises(Exception):
+        asyncio.run(main.fetch_transcript_text("abcdefghijk", allow_whisper=False))
+    assert "abcdefghijk" not in main._no_transcript_cache
+
+
+def test_transient_failures_expire_much_sooner_than_permanent_ones(monkeypatch):
+    monkeypatch.setattr(main, "NO_TRANSCRIPT_TTL_SEC", 60)
+    assert main._no_transcript_ttu("abcdefghijk", (Exception, "boom"), 100.0) == 160.0
+    permanent = main._no_transcript_ttu("abcdefghijk", (main.PermanentVideoError, "gone"), 100.0)
+    assert permanent == 100.0 + main.UNAVAILABLE_VIDEO_TTL_SEC
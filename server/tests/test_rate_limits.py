@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    """main이 보는 시계와 asyncio.sleep을 가짜로 바꿔, 잠든 시간만큼 시계를 앞당김 (실제로는 기다리지 않음)"""
+    clock = SimpleNamespace(now=0.0, slept=[])
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        clock.slept.append(delay)
+        clock.now += delay
+        await real_sleep(0)
+
+    monkeypatch.setattr(main, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return clock
+
+
+def test_token_bucket_allows_burst_then_paces(fake_time):
+    async def run():
+        bucket = main.AsyncTokenBucket(rate=20, burst=3)
+        for _ in range(3):
+            await bucket.acquire()
+        burst_slept = list(fake_time.slept)
+        for _ in range(2):
+            await bucket.acquire()
+        return burst_slept
+
+    assert asyncio.run(run()) == []
+    # 버스트 이후 2개는 초당 20개 속도 → 각각 0.05초씩 대기
+    assert fake_time.slept == pytest.approx([0.05, 0.05])
+    assert fake_time.now == pytest.approx(0.1)
+
+
+def test_token_bucket_refills_while_idle(fake_time):
+    async def run():
+        bucket = main.AsyncTokenBucket(rate=10, burst=2)
+        await bucket.acquire()
+        await bucket.acquire()
+        fake_time.now += 1.0  # 1초 쉬는 동안 버스트 한도까지만 다시 참
+        for _ in range(3):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    assert fake_time.slept == pytest.approx([0.1])
+
+
+def test_llm_slot_raises_busy_when_queue_wait_times_out(monkeypatch):
+    monkeypatch.setattr(main, "_llm_semaphore", asyncio.Semaphore(1))
+    monkeypatch.setattr(main, "LLM_QUEUE_TIMEOUT_SEC", 0.01)
+
+    async def run():
+        async with main._llm_slot():
+            with pytest.raises(main.LLMBusyError):
+                async with main._llm_slot():
+                    pass
+        # 첫 슬롯이 반납되면 다시 얻을 수 있음
+        async with main._llm_slot():
+            pass
+
+    asyncio.run(run())
+
+
+def test_llm_busy_maps_to_503_with_retry_after():
+    error = main._rate_limited_http_exception(main.LLMBusyError("busy"))
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == main.LLM_BUSY_RETRY_AFTER
+
+
+def test_chat_returns_503_when_every_llm_slot_is_taken(monkeypatch):
+    monkeypatch.setattr(main, "_llm_semaphore", asyncio.Semaphore(0))
+    monkeypatch.setattr(main, "LLM_QUEUE_TIMEOUT_SEC", 0)
+    monkeypatch.setattr(main, "CHAT_CACHE_TTL_SEC", 0)
+
+    with TestClient(main.app) as client:
+        response = client.post("/chat", json={"message": "안녕하세요"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == main.LLM_BUSY_RETRY_AFTER
@@ -0,0 +1,68 @@
+import asyncio
+
+import main
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        results = await asyncio.gather(*(main._single_flight("key", work) for _ in range(5)))
+        return results, dict(main._inflight)
+
+    results, inflight_after = asyncio.run(run())
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert inflight_after == {}
+
+
+def test_single_flight_survives_a_cancelled_waiter():
+    calls = 0
+
+    async def run():
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(main._single_flight("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        second = asyncio.create_task(main._single_flight("key", work))
+        await asyncio.sleep(0)
+        release.set()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ("result", True)
+    assert calls == 1
+
+
+def test_single_flight_shares_a_failure_and_allows_a_retry():
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("추출 실패")
+
+    async def run():
+        results = await asyncio.gather(
+            *(main._single_flight("key", failing) for _ in range(3)), return_exceptions=True
+        )
+        # 실패한 작업은 남겨두지 않으므로 다음 호출은 새로 실행됨
+        retry = await asyncio.gather(main._single_flight("key", failing), return_exceptions=True)
+        return results + retry
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert calls == 2
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import httpx
+import orjson
+from cachetools import TLRUCache
+from fastapi.testclient import TestClient
+
+import main
+
+
+class _FakeYoutubeDL:
+    """직접 받을 수 있는 오디오 URL 하나를 돌려주는 yt-dlp 대역"""
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        return {
+            "id": "abcdefghijk",
+            "ext": "m4a",
+            "duration": 321,
+            "protocol": "https",
+            "url": "https://media.example/audio.m4a",
+            "http_headers": {},
+        }
+
+
+def _completion_chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class _FakeOpenAI:
+    """Whisper 전사(동기)와 요약 스트리밍(비동기)을 흉내 내는 OpenAI 대역"""
+
+    def __init__(self):
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._transcribe))
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+        self.uploads = []
+
+    def _transcribe(self, **kwargs):
+        self.uploads.append(kwargs["file"])
+        return " 전사된 자막입니다. "
+
+    async def _complete(self, **kwargs):
+        assert kwargs["stream"]
+
+        async def stream():
+            for text in ["요약", " 결과"]:
+                yield _completion_chunk(text)
+
+        return stream()
+
+
+def test_id_stream_runs_whisper_path_with_stubbed_ytdlp_and_openai(monkeypatch):
+    def no_captions(video_id):
+        raise main.NoTranscriptFound(video_id, [], None)
+
+    monkeypatch.setattr(main, "ENABLE_WHISPER_FALLBACK", True)
+    monkeypatch.setattr(main, "FFMPEG_PATH", None)
+    monkeypatch.setattr(main, "YOUTUBE_API_KEY", None)
+    monkeypatch.setattr(main, "_fetch_youtube_captions", no_captions)
+    monkeypatch.setattr(main, "_yt_dlp", lambda: SimpleNamespace(YoutubeDL=_FakeYoutubeDL))
+    monkeypatch.setattr(main, "AUDIO_DOWNLOAD_STRATEGIES", [(main._download_audio_with_ytdlp, "whisper")])
+    monkeypatch.setattr(main, "_no_transcript_cache", TLRUCache(maxsize=10, ttu=main._no_transcript_ttu))
+    fake_openai = _FakeOpenAI()
+
+    with TestClient(main.app) as client:
+        main.app.state.oai = fake_openai
+        main.app.state.oai_sync = fake_openai
+        main.app.state.http_media = httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"audio-bytes"))
+        )
+        body = client.post("/summarize/abcdefghijk/stream").text
+
+    events = [
+        (block.split("\n")[0], orjson.loads(block.split("data: ", 1)[1]))
+        for block in body.strip().split("\n\n")
+    ]
+    stages = [data["stage"] for event, data in events if event == "event: progress"]
+    assert stages == ["transcript", "captions", "download", "transcribe", "summary"]
+    event, result = events[-1]
+    assert event == "event: done"
+    assert result["summary"] == "요약 결과"
+    assert result["method"] == "Whisper + AI"
+    assert result["duration"] == 321
+    assert fake_openai.uploads == [("abcdefghijk.m4a", b"audio-bytes")]
+    assert main.get_cached_result("abcdefghijk") == result
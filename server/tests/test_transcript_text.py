@@ -0,0 +1,109 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def char_tokens(monkeypatch):
+    """tiktoken 없이 글자 수로 토큰을 세는 근사 모드"""
+    monkeypatch.setattr(main, "_get_token_encoder", lambda: None)
+
+
+def _sentences(count):
+    return [f"문장 번호 {i}는 테스트용으로 조금 길게 만든 내용입니다." for i in range(count)]
+
+
+def test_split_transcript_keeps_chunks_within_max_tokens(char_tokens):
+    text = " ".join(_sentences(200))
+    chunks = main._split_transcript(text, max_tokens=300, overlap_tokens=60)
+    assert len(chunks) > 1
+    # 이어 붙인 공백까지 포함해도 한도를 넘지 않아야 함
+    assert max(len(chunk) for chunk in chunks) <= 300
+    for sentence in _sentences(200):
+        assert any(sentence in chunk for chunk in chunks)
+
+
+def test_split_transcript_overlaps_consecutive_chunks(char_tokens):
+    chunks = main._split_transcript(" ".join(_sentences(50)), max_tokens=300, overlap_tokens=60)
+    for previous, current in zip(chunks, chunks[1:]):
+        last_sentence = previous.split(". ")[-1]
+        assert current.startswith(last_sentence)
+
+
+def test_split_transcript_hard_splits_a_sentence_longer_than_the_limit(char_tokens):
+    chunks = main._split_transcript("가" * 1000, max_tokens=300, overlap_tokens=0)
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+
+
+def test_token_encoder_failure_is_retried_after_the_interval(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    attempts = []
+    encoder = object()
+
+    def encoding_for_model(model):
+        attempts.append(model)
+        if len(attempts) == 1:
+            raise OSError("BPE 파일 다운로드 실패")
+        return encoder
+
+    monkeypatch.setitem(sys.modules, "tiktoken", SimpleNamespace(encoding_for_model=encoding_for_model))
+    monkeypatch.setattr(main, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(main, "_token_encoder", None)
+    monkeypatch.setattr(main, "_token_encoder_failed_at", None)
+
+    assert main._get_token_encoder() is None
+    assert main._get_token_encoder() is None  # 재시도 간격 전에는 다시 시도하지 않음
+    assert len(attempts) == 1
+
+    clock.now += main.TOKEN_ENCODER_RETRY_SEC
+    assert main._get_token_encoder() is encoder
+    assert main._get_token_encoder() is encoder  # 성공한 인코더는 보관
+    assert len(attempts) == 2
+
+
+def test_condense_transcript_leaves_short_text_alone(char_tokens, monkeypatch):
+    async def must_not_compress(chunk):
+        raise AssertionError("예산 안의 자막은 압축하지 않음")
+
+    monkeypatch.setattr(main, "_compress_chunk", must_not_compress)
+    assert asyncio.run(main._condense_transcript("짧은 자막입니다.")) == "짧은 자막입니다."
+
+
+def test_condense_transcript_compresses_every_chunk_when_over_budget(char_tokens, monkeypatch):
+    compressed = []
+
+    async def compress(chunk):
+        compressed.append(chunk)
+        return "메모"
+
+    monkeypatch.setattr(main, "_compress_chunk", compress)
+    monkeypatch.setattr(main, "SUMMARY_INPUT_TOKEN_BUDGET", 500)
+    text = " ".join(_sentences(400))
+    result = asyncio.run(main._condense_transcript(text))
+    assert len(compressed) == len(main._split_transcript(text))
+    assert result == "\n".join(["메모"] * len(compressed))
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Hello [Music] world (applause) again", "Hello world again"),
+    ("음 이건 (박수) 정말 좋아요 [웃음]", "이건 정말 좋아요"),
+    ("um, the market is uh growing. Hmm.", "the market is growing."),
+    ("the the the the market", "the market"),
+    ("정말 정말 정말 좋아요", "정말 좋아요"),
+    ("  줄바꿈과\n\n   공백이   많은   자막  ", "줄바꿈과 공백이 많은 자막"),
+])
+def test_compact_transcript_drops_cues_fillers_and_stutters(raw, expected):
+    assert main._compact_transcript(raw) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "umbrella and summer",  # 군말이 단어 일부인 경우
+    "the the market",  # 두 번 반복은 강조일 수 있으므로 유지
+    "Music festival and applause rules",  # 괄호 없는 단어는 효과음 표기가 아님
+])
+def test_compact_transcript_keeps_real_words(text):
+    assert main._compact_transcript(text) == text
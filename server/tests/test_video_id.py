@@ -0,0 +1,33 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/watch?v=abcdefghijk",
+    "youtube.com/watch?feature=share&v=abcdefghijk&t=30",
+    "https://m.youtube.com/shorts/abcdefghijk?si=x",
+    "https://music.youtube.com/watch?v=abcdefghijk#t=10",
+    "https://www.youtube.com/embed/abcdefghijk",
+    "https://www.youtube.com/v/abcdefghijk",
+    "https://www.youtube.com/live/abcdefghijk",
+    "https://youtu.be/abcdefghijk",
+    "  https://youtu.be/abcdefghijk?t=5  ",
+])
+def test_extract_video_id_accepts_supported_formats(url):
+    assert main.extract_video_id(url) == "abcdefghijk"
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    "abcdefghijk",
+    "https://evil.com/youtube.com/watch?v=abcdefghijk",
+    "https://evil.com/?next=youtu.be/abcdefghijk",
+    "https://youtube.com.evil.com/watch?v=abcdefghijk",
+    "https://notyoutube.com/watch?v=abcdefghijk",
+    "https://www.youtube.com/watch?v=abcdefghij",
+    "https://youtu.be/abcdefghijkl",
+    "https://www.youtube.com/watch?list=abcdefghijk",
+])
+def test_extract_video_id_rejects_other_urls(url):
+    assert main.extract_video_id(url) is None